@@ -1,8 +1,49 @@
+import gzip
+import hashlib
+import heapq
 import json
+import os
 import re
-from typing import Dict, List, Tuple, Optional
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import groupby, islice
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Sized, Tuple, Union
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+try:
+    from .rhyme_lexicon import MappedLexicon, MappedSnapshot, read_json_translations, write_lexicon, write_snapshot
+except ImportError:
+    from rhyme_lexicon import MappedLexicon, MappedSnapshot, read_json_translations, write_lexicon, write_snapshot
+
+LANGUAGES = ('english', 'spanish', 'french')
+
+# NumPy is only needed by the 'numpy' scoring backend and takes longer to
+# import than the rest of the engine, so it is loaded on first use
+np = None
+_numpy_loaded = False
+
+def _load_numpy():
+    """Import NumPy on first use (None when it is not installed)"""
+    global np, _numpy_loaded
+    if not _numpy_loaded:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+        _numpy_loaded = True
+    return np
+
+_MISSING = object()
 
 @dataclass
 class RhymeResult:
@@ -13,14 +54,1432 @@ class RhymeResult:
     similarity: float
     translation: Optional[Dict[str, str]] = None
 
-class MultilingualRhymeEngine:
+@dataclass(frozen=True)
+class FrozenRhymeResult:
+    """Immutable, slotted variant of RhymeResult"""
+    __slots__ = ('word', 'phonetic', 'suffix', 'syllables', 'similarity', 'translation')
+    word: str
+    phonetic: str
+    suffix: str
+    syllables: int
+    similarity: float
+    translation: Optional[Dict[str, str]]
+
+    def __reduce__(self):
+        return (FrozenRhymeResult, (self.word, self.phonetic, self.suffix, self.syllables,
+                                    self.similarity, self.translation))
+
+class _DetachedRows(NamedTuple):
+    words: List[str]
+    phonetics: List[str]
+    suffixes: List[str]
+
+class RhymeResultSet:
+    """Columnar rhyme results: parallel arrays of word ids, scores and syllables
+
+    Word ids point into the language's rhyme index. Rows are materialized as
+    FrozenRhymeResult only when accessed, and translations are looked up then.
+    """
+    __slots__ = ('language', '_source', '_ids', '_similarities', '_syllables', '_translate')
+
+    def __init__(self, language: str, source, ids: Iterable[int], similarities: Iterable[float],
+                 syllables: Iterable[int], translate: Callable[[str], Optional[Dict[str, str]]]):
+        self.language = language
+        self._source = source
+        self._ids = array('I', ids)
+        self._similarities = array('d', similarities)
+        self._syllables = array('H', syllables)
+        self._translate = translate
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._row(j) for j in range(*i.indices(len(self._ids)))]
+        if i < 0:
+            i += len(self._ids)
+        if not 0 <= i < len(self._ids):
+            raise IndexError('result index out of range')
+        return self._row(i)
+
+    def __iter__(self) -> Iterator[FrozenRhymeResult]:
+        return (self._row(i) for i in range(len(self._ids)))
+
+    def __repr__(self) -> str:
+        return f'RhymeResultSet({self.language!r}, {len(self)} rows)'
+
+    def __sizeof__(self) -> int:
+        return (object.__sizeof__(self) + self._ids.__sizeof__() +
+                self._similarities.__sizeof__() + self._syllables.__sizeof__())
+
+    def _row(self, i: int) -> FrozenRhymeResult:
+        word_id = self._ids[i]
+        word = self._source.words[word_id]
+        return FrozenRhymeResult(word, self._source.phonetics[word_id], self._source.suffixes[word_id],
+                                 self._syllables[i], self._similarities[i], self._translate(word))
+
+    @property
+    def word_ids(self) -> memoryview:
+        return memoryview(self._ids).toreadonly()
+
+    @property
+    def similarities(self) -> memoryview:
+        return memoryview(self._similarities).toreadonly()
+
+    @property
+    def syllables(self) -> memoryview:
+        return memoryview(self._syllables).toreadonly()
+
+    def words(self) -> List[str]:
+        return [self._source.words[word_id] for word_id in self._ids]
+
+    def to_results(self) -> List[RhymeResult]:
+        """Materialize every row as a mutable RhymeResult"""
+        return [RhymeResult(row.word, row.phonetic, row.suffix, row.syllables, row.similarity, row.translation)
+                for row in self]
+
+    def __reduce__(self):
+        # Detach from the engine's index: ship only the selected rows and
+        # their resolved translations
+        rows = list(self)
+        source = _DetachedRows([row.word for row in rows], [row.phonetic for row in rows],
+                               [row.suffix for row in rows])
+        translations = {row.word: row.translation for row in rows}
+        return (RhymeResultSet, (self.language, source, range(len(rows)), self._similarities,
+                                 self._syllables, translations.get))
+
+class _TransducerTable:
+    """Lazily filled states and transitions of a PhoneticTransducer"""
+    __slots__ = ('state_ids', 'buffers', 'transitions', 'finals')
+
     def __init__(self):
+        self.state_ids: Dict[Tuple[str, ...], int] = {}
+        self.buffers: List[Tuple[str, ...]] = []
+        self.transitions: List[Dict[str, Tuple[int, str]]] = []
+        self.finals: List[Optional[str]] = []
+
+class PhoneticTransducer:
+    """Single-pass transducer equivalent to applying the phonetic rules in order
+
+    Each rule behaves like re.sub on the output of the previous rule, so a
+    plain longest-match table cannot reproduce it (rules rewrite each other's
+    output, e.g. 'ay' -> 'eɪ' -> 'ɛɪ'). Instead every rule is a small streaming
+    replacer and the whole chain is determinized lazily: a state is the tuple
+    of pending partial matches, and each (state, char) step is computed once
+    and then served from the transition table.
+
+    Unusual input can keep adding states, so once the table holds more than
+    max_states it is replaced by an empty one; words already being read
+    finish on the old table.
+    """
+
+    def __init__(self, rules: List[Tuple[str, str]], max_states: int = 1 << 16):
+        # Identity rules never change the string, so they can be dropped
+        self.rules = [(pattern, sound) for pattern, sound in rules
+                      if pattern and sound and pattern != sound]
+        self.max_states = max_states
+        self._lock = threading.Lock()
+        self._table = self._new_table()
+
+    def _new_table(self) -> _TransducerTable:
+        table = _TransducerTable()
+        # The start state is always state 0
+        self._intern(table, ('',) * len(self.rules))
+        return table
+
+    @staticmethod
+    def _intern(table: _TransducerTable, buffers: Tuple[str, ...]) -> int:
+        state = table.state_ids.get(buffers)
+        if state is None:
+            state = len(table.buffers)
+            table.state_ids[buffers] = state
+            table.buffers.append(buffers)
+            table.transitions.append({})
+            table.finals.append(None)
+        return state
+
+    def _push(self, buffers: List[str], stage: int, char: str, out: List[str]):
+        rules = self.rules
+        while stage < len(rules):
+            pattern, sound = rules[stage]
+            pending = buffers[stage]
+            
+            # Most characters meet an idle stage they cannot start a match
+            # in; pass them straight on without recursing
+            if not pending and char != pattern[0]:
+                stage += 1
+                continue
+            
+            pending += char
+            if pending == pattern:
+                buffers[stage] = ''
+                for sound_char in sound:
+                    self._push(buffers, stage + 1, sound_char, out)
+                return
+            
+            # Release the characters that can no longer start a match
+            start = 0
+            while not pattern.startswith(pending[start:]):
+                start += 1
+            buffers[stage] = pending[start:]
+            for released in pending[:start]:
+                self._push(buffers, stage + 1, released, out)
+            return
+        
+        out.append(char)
+
+    def _step(self, table: _TransducerTable, state: int, char: str) -> Tuple[int, str]:
+        with self._lock:
+            step = table.transitions[state].get(char)
+            if step is None:
+                buffers = list(table.buffers[state])
+                out: List[str] = []
+                self._push(buffers, 0, char, out)
+                step = (self._intern(table, tuple(buffers)), ''.join(out))
+                table.transitions[state][char] = step
+                if len(table.buffers) > self.max_states and table is self._table:
+                    self._table = self._new_table()
+            return step
+
+    def _final(self, table: _TransducerTable, state: int) -> str:
+        with self._lock:
+            final = table.finals[state]
+            if final is None:
+                buffers = list(table.buffers[state])
+                out: List[str] = []
+                for stage in range(len(self.rules)):
+                    pending, buffers[stage] = buffers[stage], ''
+                    for char in pending:
+                        self._push(buffers, stage + 1, char, out)
+                final = ''.join(out)
+                table.finals[state] = final
+            return final
+
+    def __len__(self) -> int:
+        """States in the current table"""
+        return len(self._table.buffers)
+
+    def transduce(self, word: str) -> str:
+        """Convert an already lower-cased word in one left-to-right pass"""
+        table = self._table
+        transitions = table.transitions
+        state = 0
+        out = []
+        for char in word:
+            step = transitions[state].get(char)
+            if step is None:
+                step = self._step(table, state, char)
+            state, emitted = step
+            if emitted:
+                out.append(emitted)
+
+        final = table.finals[state]
+        if final is None:
+            final = self._final(table, state)
+        out.append(final)
+        return ''.join(out)
+
+class SyllableCounter:
+    """Vowel-group syllable counter for one language, with its patterns compiled once
+
+    A word has one syllable per vowel match, less one per diphthong match
+    and, when silent_e is set, less a final silent 'e'; never fewer than one.
+    """
+    __slots__ = ('_vowels', '_diphthongs', '_silent_e')
+
+    def __init__(self, vowels: str, diphthongs: Optional[str] = None, silent_e: bool = False):
+        self._vowels = re.compile(vowels)
+        self._diphthongs = re.compile(diphthongs) if diphthongs else None
+        self._silent_e = silent_e
+
+    def __call__(self, lower_word: str) -> int:
+        count = len(self._vowels.findall(lower_word))
+        if self._diphthongs is not None:
+            count -= len(self._diphthongs.findall(lower_word))
+        if self._silent_e and count > 1 and lower_word.endswith('e'):
+            count -= 1
+        return max(1, count)
+
+_SYLLABLE_COUNTERS = {
+    'english': SyllableCounter(r'[aeiouy]+', silent_e=True),
+    'spanish': SyllableCounter(r'[aeiouáéíóúü]', diphthongs=r'[aeiou][aeiou]'),
+    'french': SyllableCounter(r'[aeiouyàâéèêëïîôöùûü]', silent_e=True)
+}
+
+def _shared_tail_needed(suffix: str, threshold: float) -> int:
+    """Trailing characters a suffix must share with suffix to reach threshold"""
+    # similarity = shared tail / longer suffix, so anything sharing fewer
+    # characters than this scores below threshold whatever its length
+    shared = 0
+    while shared < len(suffix) and shared / len(suffix) < threshold:
+        shared += 1
+    return shared
+
+class _ReversedSuffixKeys:
+    """Sorted reversed-suffix keys computed on demand from a stored order"""
+
+    def __init__(self, suffixes: Sequence[str], order: Sequence[int]):
+        self._suffixes = suffixes
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, i: int) -> str:
+        return self._suffixes[self._order[i]][::-1]
+
+class _ExtendedColumn:
+    """A read-only column (e.g. a mapped lexicon's) with entries appended in memory"""
+
+    def __init__(self, base: Sequence):
+        self._base = base
+        self._base_length = len(base)
+        self._extra = []
+
+    def __len__(self) -> int:
+        return self._base_length + len(self._extra)
+
+    def __getitem__(self, i: int):
+        if i < self._base_length:
+            return self._base[i]
+        return self._extra[i - self._base_length]
+
+    def append(self, value):
+        self._extra.append(value)
+
+class _LiveWords(Sequence):
+    """Read-only view of the words currently in a rhyme index, in dictionary order"""
+
+    def __init__(self, index: 'RhymeIndex'):
+        self._index = index
+        self._positions = (None, None)
+
+    def _live(self) -> Sequence[int]:
+        state, positions = self._positions
+        if state is not self._index._state:
+            state = self._index._state
+            positions = array('I', self._index.live_positions())
+            self._positions = (state, positions)
+        return positions
+
+    def __len__(self) -> int:
+        return len(self._live())
+
+    def __getitem__(self, i):
+        positions = self._live()
+        if isinstance(i, slice):
+            return [self._index.words[position] for position in positions[i]]
+        return self._index.words[positions[i]]
+
+    def __iter__(self) -> Iterator[str]:
+        words = self._index.words
+        return (words[position] for position in self._live())
+
+    def __contains__(self, word) -> bool:
+        return word in self._index
+
+    def __repr__(self) -> str:
+        return f'<{len(self)} words>'
+
+def _walk(keys: Sequence[str], positions: Sequence[int], prefix: str) -> List[int]:
+    """Positions of the sorted keys that start with prefix"""
+    found = []
+    i = bisect_left(keys, prefix)
+    while i < len(keys) and keys[i].startswith(prefix):
+        found.append(positions[i])
+        i += 1
+    return found
+
+
+def _outward(buckets: Dict[int, List[int]], syllables: int) -> Iterator[Tuple[int, Iterable[int]]]:
+    """Walk syllable-count buckets outward from syllables
+    
+    Yields (syllable distance, positions in order) for each distance that
+    has a bucket on either side. Buckets must already be in dictionary
+    order, as they are when filled from candidates in that order.
+    """
+    for distance in sorted({abs(count - syllables) for count in buckets}):
+        below = buckets.get(syllables - distance)
+        above = buckets.get(syllables + distance) if distance else None
+        if below is not None and above is not None:
+            yield distance, heapq.merge(below, above)
+        else:
+            yield distance, below if below is not None else above
+
+
+def _syllable_range(syllables: int, min_syllables: Optional[int], max_syllables: Optional[int],
+                    same_syllables: bool) -> Optional[Tuple[int, int]]:
+    """Inclusive (low, high) syllable counts a query keeps, or None to keep all"""
+    if same_syllables:
+        min_syllables = syllables if min_syllables is None else max(min_syllables, syllables)
+        max_syllables = syllables if max_syllables is None else min(max_syllables, syllables)
+    if min_syllables is None and max_syllables is None:
+        return None
+    return (0 if min_syllables is None else min_syllables,
+            sys.maxsize if max_syllables is None else max_syllables)
+
+
+def _ranked_rows(levels: Dict[float, Dict[int, List[int]]], syllables: int) -> Iterator[tuple]:
+    """(-similarity, syllable distance, position) rows, best first, from similarity -> syllable buckets"""
+    for similarity in sorted(levels, reverse=True):
+        for distance, positions in _outward(levels[similarity], syllables):
+            for position in positions:
+                yield -similarity, distance, position
+
+
+def _deletion_variants(text: str, distance: int) -> set:
+    """Every string reachable from text by deleting at most distance characters"""
+    variants = {text}
+    frontier = {text}
+    for _ in range(distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+def _bounded_edit_distance(a: str, b: str, bound: int) -> int:
+    """Levenshtein distance of a and b, or bound + 1 once it must exceed bound"""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    # Only cells within bound of the diagonal can stay within bound
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        low = max(1, i - bound)
+        high = min(len(b), i + bound)
+        current = [bound + 1] * (len(b) + 1)
+        if low == 1:
+            current[0] = i
+        for j in range(low, high + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != b[j - 1]))
+        if min(current[low - 1:high + 1]) > bound:
+            return bound + 1
+        previous = current
+    return min(previous[-1], bound + 1)
+
+class RhymeIndex:
+    """Per-language lexicon index keyed on reversed phonetic suffixes
+
+    Words sharing a rhyming tail share a prefix of their reversed suffix, so
+    all candidates that can reach a similarity threshold sit in one
+    contiguous range of the sorted key array.
+
+    Words added later go to a small sorted delta and removed words are
+    tombstoned; both are folded into the sorted arrays once they outgrow
+    a fraction of the index. Every change publishes a new state tuple, so
+    queries on other threads read one consistent version without locking.
+    Removed entries stay in the columns, keeping their positions valid for
+    result sets that still refer to them. Read-only columns (a mapped
+    lexicon's) stay in place; added entries are kept in memory next to them.
+    
+    Adding and removing words looks words up by name. Given word_order
+    (positions sorted by word, as stored in lexicon files) that is a
+    bisect; otherwise a word -> positions map of the whole index is built
+    on the first change.
+    """
+
+    def __init__(self, words: Sequence[str], phonetics: Sequence[str], suffixes: Sequence[str],
+                 syllables: Sequence[int], order: Optional[Sequence[int]] = None,
+                 word_order: Optional[Sequence[int]] = None):
+        self.words = words
+        self.phonetics = phonetics
+        self.suffixes = suffixes
+        self.syllables = syllables
+        
+        if order is None:
+            order = sorted(range(len(words)), key=lambda i: suffixes[i][::-1])
+            keys = [suffixes[i][::-1] for i in order]
+        else:
+            # Prebuilt order (e.g. from a mapped lexicon): derive keys on access
+            keys = _ReversedSuffixKeys(suffixes, order)
+        
+        # (sorted keys, their positions, added keys, added positions, removed positions)
+        self._state = (keys, order, [], [], frozenset())
+        self._size = len(words)
+        self._delta_start = len(words)
+        self._lock = threading.Lock()
+        # With word_order the map only holds words added later, and
+        # removed base positions are remembered separately
+        self._word_order = word_order
+        self._word_positions: Optional[Dict[str, List[int]]] = defaultdict(list) if word_order is not None else None
+        self._removed_base = set()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def candidates(self, suffix: str, threshold: float) -> List[int]:
+        """Dictionary positions that may score at least threshold against suffix"""
+        prefix = suffix[::-1][:_shared_tail_needed(suffix, threshold)]
+        keys, order, added_keys, added_positions, removed = self._state
+        
+        positions = _walk(keys, order, prefix)
+        if removed:
+            positions = [position for position in positions if position not in removed]
+        if added_keys:
+            positions += _walk(added_keys, added_positions, prefix)
+        
+        # Keep dictionary order so ties sort exactly as a linear scan would
+        positions.sort()
+        return positions
+
+    def live_positions(self) -> List[int]:
+        """Positions of every word currently in the index, in dictionary order"""
+        _, order, _, added_positions, removed = self._state
+        positions = [position for position in order if position not in removed] if removed else list(order)
+        positions += added_positions
+        positions.sort()
+        return positions
+
+    def _positions_of(self) -> Dict[str, List[int]]:
+        if self._word_positions is None:
+            lookup = defaultdict(list)
+            for position in self.live_positions():
+                lookup[self.words[position]].append(position)
+            self._word_positions = lookup
+        return self._word_positions
+
+    def _base_positions(self, word: str) -> List[int]:
+        """Live positions of word among the entries the index was built with"""
+        words, word_order = self.words, self._word_order
+        low, high = 0, len(word_order)
+        while low < high:
+            middle = (low + high) // 2
+            if words[word_order[middle]] < word:
+                low = middle + 1
+            else:
+                high = middle
+        positions = []
+        while low < len(word_order) and words[word_order[low]] == word:
+            if word_order[low] not in self._removed_base:
+                positions.append(word_order[low])
+            low += 1
+        return positions
+
+    def __contains__(self, word: str) -> bool:
+        with self._lock:
+            if word in self._positions_of():
+                return True
+            return self._word_order is not None and bool(self._base_positions(word))
+
+    def add(self, words: Sequence[str], phonetics: Sequence[str], suffixes: Sequence[str],
+            syllables: Sequence[int]) -> bool:
+        """Append entries; True when this folded the delta into the sorted arrays"""
+        with self._lock:
+            keys, order, added_keys, added_positions, removed = self._state
+            added_keys = list(added_keys)
+            added_positions = list(added_positions)
+            lookup = self._positions_of()
+            if not hasattr(self.words, 'append'):
+                self.words, self.phonetics, self.suffixes, self.syllables = (
+                    _ExtendedColumn(column) for column in (self.words, self.phonetics, self.suffixes, self.syllables))
+            
+            for word, phonetic, suffix, count in zip(words, phonetics, suffixes, syllables):
+                position = len(self.words)
+                self.words.append(word)
+                self.phonetics.append(phonetic)
+                self.suffixes.append(suffix)
+                self.syllables.append(count)
+                lookup[word].append(position)
+                
+                key = suffix[::-1]
+                i = bisect_right(added_keys, key)
+                added_keys.insert(i, key)
+                added_positions.insert(i, position)
+            
+            self._size += len(words)
+            return self._publish(keys, order, added_keys, added_positions, removed)
+
+    def remove(self, words: Iterable[str]) -> List[str]:
+        """Tombstone every entry of words, returning the words that were present"""
+        with self._lock:
+            keys, order, added_keys, added_positions, removed = self._state
+            lookup = self._positions_of()
+            
+            present = []
+            dropped = set()
+            for word in words:
+                positions = lookup.pop(word, None) or []
+                if self._word_order is not None:
+                    base = self._base_positions(word)
+                    self._removed_base.update(base)
+                    positions += base
+                if positions:
+                    present.append(word)
+                    dropped.update(positions)
+            if not dropped:
+                return present
+            
+            # Entries still in the delta are simply left out of the next one
+            in_delta = {position for position in dropped if position >= self._delta_start}
+            if in_delta:
+                kept = [(key, position) for key, position in zip(added_keys, added_positions)
+                        if position not in in_delta]
+                added_keys = [key for key, _ in kept]
+                added_positions = [position for _, position in kept]
+            
+            self._size -= len(dropped)
+            self._publish(keys, order, added_keys, added_positions, removed | (dropped - in_delta))
+            return present
+
+    def _publish(self, keys, order, added_keys, added_positions, removed) -> bool:
+        if len(added_keys) + len(removed) <= max(1024, len(keys) // 8):
+            self._state = (keys, order, added_keys, added_positions, removed)
+            return False
+        
+        live = ((key, position) for key, position in zip(keys, order) if position not in removed)
+        merged = list(heapq.merge(live, zip(added_keys, added_positions)))
+        self._state = ([key for key, _ in merged], [position for _, position in merged], [], [], frozenset())
+        self._delta_start = len(self.words)
+        return True
+
+class CrossLanguageIndex:
+    """The language indexes behind cross-language queries
+
+    All three phonetic rule sets write into the same IPA-style alphabet, so
+    one reversed input suffix can be walked through every language's
+    index. Each language index answers the walk against its own sorted
+    arrays and delta, so no merged copy of the keys is kept and added or
+    removed words show up right away.
+    """
+
+    def __init__(self, indexes: Dict[str, RhymeIndex]):
+        self.indexes = indexes
+        self.languages = list(indexes)
+
+    def candidates(self, suffix: str, threshold: float, languages: Iterable[str]) -> Dict[str, List[int]]:
+        """Positions per language that may score at least threshold against suffix"""
+        return {language: self.indexes[language].candidates(suffix, threshold) for language in languages}
+
+class SlantIndex:
+    """Edit-distance index over the phonetic tails of a rhyme index
+
+    Two tails within k edits can both be reduced to a common string by at
+    most k deletions, so each distinct tail is filed under its deletion
+    variants and a query only verifies the tails sharing a variant with its
+    own. Words added to the rhyme index afterwards are checked directly from
+    its delta and removed words are skipped.
+    """
+
+    tail_length = 4
+
+    def __init__(self, index: RhymeIndex, max_distance: int = 1):
+        self.index = index
+        self.max_distance = max_distance
+        keys, order = index._state[0], index._state[1]
+        self._base = keys
+        
+        self._tails: List[str] = []
+        self._positions: List[List[int]] = []
+        tail_ids: Dict[str, int] = {}
+        for position in order:
+            tail = index.phonetics[position][-self.tail_length:]
+            tail_id = tail_ids.get(tail)
+            if tail_id is None:
+                tail_id = tail_ids[tail] = len(self._tails)
+                self._tails.append(tail)
+                self._positions.append([])
+            self._positions[tail_id].append(position)
+        
+        variants = defaultdict(list)
+        for tail_id, tail in enumerate(self._tails):
+            for variant in _deletion_variants(tail, max_distance):
+                variants[variant].append(tail_id)
+        self._variants = dict(variants)
+
+    def neighbours(self, phonetic: str, max_distance: int) -> List[Tuple[int, int]]:
+        """(position, distance) of every word whose phonetic tail is within max_distance edits, in dictionary order"""
+        if max_distance > self.max_distance:
+            raise ValueError(f'Index was built for at most {self.max_distance} edits')
+        tail = phonetic[-self.tail_length:]
+        _, _, _, added_positions, removed = self.index._state
+        
+        hits = []
+        seen = set()
+        for variant in _deletion_variants(tail, max_distance):
+            for tail_id in self._variants.get(variant, ()):
+                if tail_id in seen:
+                    continue
+                seen.add(tail_id)
+                distance = _bounded_edit_distance(tail, self._tails[tail_id], max_distance)
+                if distance <= max_distance:
+                    hits.extend((position, distance) for position in self._positions[tail_id]
+                                if position not in removed)
+        
+        phonetics = self.index.phonetics
+        for position in added_positions:
+            distance = _bounded_edit_distance(tail, phonetics[position][-self.tail_length:], max_distance)
+            if distance <= max_distance:
+                hits.append((position, distance))
+        hits.sort()
+        return hits
+
+class RhymeFamilies:
+    """Rhyme families of a rhyme index, materialized for direct lookups
+
+    Words with the same suffix form one family, stored grouped by syllable
+    count, and each family lists the families it scores at least
+    min_similarity against. A query whose suffix is a family walks those
+    buckets outward from its own syllable count, so rows come out already
+    ranked and a limited query reads only the rows it returns. Words added
+    to the index afterwards are scored from its delta and merged in;
+    removed words are skipped.
+    """
+
+    def __init__(self, index: RhymeIndex, similarity: Callable[[str, str], float], min_similarity: float = 0.6):
+        self.index = index
+        self.min_similarity = min_similarity
+        self._similarity = similarity
+        keys, order = index._state[0], index._state[1]
+        self._base = keys
+        syllables = index.syllables
+        
+        # Equal suffixes are adjacent in the index order, so each run of
+        # equal keys is one family; bucket b spans members[starts[b]:starts[b + 1]]
+        self._keys: List[str] = []
+        self._bucket_offsets = array('I', [0])
+        self._bucket_syllables = array('I')
+        self._bucket_starts = array('I')
+        self._members = array('I')
+        start = 0
+        while start < len(order):
+            key = keys[start]
+            end = start + 1
+            while end < len(order) and keys[end] == key:
+                end += 1
+            previous = None
+            for position in sorted(order[start:end], key=lambda position: (syllables[position], position)):
+                if syllables[position] != previous:
+                    previous = syllables[position]
+                    self._bucket_syllables.append(previous)
+                    self._bucket_starts.append(len(self._members))
+                self._members.append(position)
+            self._keys.append(key)
+            self._bucket_offsets.append(len(self._bucket_syllables))
+            start = end
+        self._bucket_starts.append(len(self._members))
+        
+        self._family_ids = {key: family for family, key in enumerate(self._keys)}
+        self._neighbours: List[List[Tuple[float, int]]] = []
+        for key in self._keys:
+            suffix = key[::-1]
+            prefix = key[:_shared_tail_needed(suffix, min_similarity)]
+            found = []
+            i = bisect_left(self._keys, prefix)
+            while i < len(self._keys) and self._keys[i].startswith(prefix):
+                score = similarity(suffix, self._keys[i][::-1])
+                if score >= min_similarity:
+                    found.append((-score, i))
+                i += 1
+            found.sort()
+            self._neighbours.append(found)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def ranked(self, suffix: str, syllables: int, perfect_threshold: float, slant_threshold: float,
+               input_word: str, syllable_range: Optional[Tuple[int, int]] = None
+               ) -> Optional[Tuple[Iterator[tuple], Iterator[tuple]]]:
+        """Perfect and slant rows (-similarity, syllable distance, position) in rank order
+        
+        syllable_range (low, high) skips the buckets outside it. Returns None
+        when suffix is not a family or a threshold is below min_similarity,
+        so the caller has to score candidates itself.
+        """
+        family = self._family_ids.get(suffix[::-1])
+        if family is None or min(perfect_threshold, slant_threshold) < self.min_similarity:
+            return None
+        _, _, _, added_positions, removed = self.index._state
+        words = self.index.words
+        input_lower = input_word.lower()
+        low, high = syllable_range or (0, sys.maxsize)
+        
+        def skip(position):
+            return position in removed or words[position].lower() == input_lower
+        
+        tiers = ([], [])
+        for negated, neighbour in self._neighbours[family]:
+            if -negated >= perfect_threshold:
+                tiers[0].append((negated, neighbour))
+            elif -negated >= slant_threshold:
+                tiers[1].append((negated, neighbour))
+        
+        # The delta is small; score it directly and merge it into the walk
+        added = ([], [])
+        for position in added_positions:
+            if not low <= self.index.syllables[position] <= high:
+                continue
+            score = self._similarity(suffix, self.index.suffixes[position])
+            if score >= min(perfect_threshold, slant_threshold):
+                if words[position].lower() != input_lower:
+                    row = (-score, abs(self.index.syllables[position] - syllables), position)
+                    added[0 if score >= perfect_threshold else 1].append(row)
+        
+        return tuple(heapq.merge(self._walk(tier, syllables, low, high, skip), sorted(rows)) if rows else
+                     self._walk(tier, syllables, low, high, skip) for tier, rows in zip(tiers, added))
+
+    def _walk(self, tier: List[Tuple[float, int]], syllables: int, low: int, high: int,
+              skip: Callable[[int], bool]) -> Iterator[tuple]:
+        members = self._members
+        offsets = self._bucket_offsets
+        bucket_syllables = self._bucket_syllables
+        for negated, level in groupby(tier, key=lambda neighbour: neighbour[0]):
+            spans = defaultdict(list)
+            for _, family in level:
+                # A family's buckets are in syllable order
+                first = bisect_left(bucket_syllables, low, offsets[family], offsets[family + 1])
+                last = bisect_right(bucket_syllables, high, first, offsets[family + 1])
+                for bucket in range(first, last):
+                    spans[abs(bucket_syllables[bucket] - syllables)].append(
+                        range(self._bucket_starts[bucket], self._bucket_starts[bucket + 1]))
+            for distance in sorted(spans):
+                positions = heapq.merge(*((members[i] for i in span) for span in spans[distance]))
+                for position in positions:
+                    if not skip(position):
+                        yield negated, distance, position
+
+class VectorScorer:
+    """Scores a query suffix against a whole dictionary with NumPy
+
+    Suffixes are stored reversed as a fixed-width array of code points
+    (zero-padded), so the common tail of every word with the query is the
+    run of leading equal columns, computed for all rows at once. positions
+    maps rows to dictionary positions when they are not the same.
+    """
+
+    def __init__(self, suffixes: Sequence[str], positions: Optional[Sequence[int]] = None):
+        if _load_numpy() is None:
+            raise ImportError('NumPy is required for vectorized scoring')
+        
+        self.width = max((len(suffix) for suffix in suffixes), default=0)
+        padded = ''.join(suffix[::-1].ljust(self.width, '\0') for suffix in suffixes)
+        codes = np.frombuffer(padded.encode('utf-32-le'), dtype='<u4')
+        self.codes = codes.reshape(len(suffixes), self.width)
+        self.lengths = np.fromiter((len(suffix) for suffix in suffixes), dtype=np.int64, count=len(suffixes))
+        self.positions = np.asarray(positions, dtype=np.int64) if positions is not None else None
+
+    def similarities(self, suffix: str):
+        """Similarity of every dictionary suffix to suffix, as calculate_similarity scores it"""
+        query = np.frombuffer(suffix[::-1].encode('utf-32-le'), dtype='<u4')
+        width = min(len(query), self.width)
+        if width:
+            equal = self.codes[:, :width] == query[:width]
+            shared = np.logical_and.accumulate(equal, axis=1).sum(axis=1)
+        else:
+            shared = np.zeros(len(self.lengths), dtype=np.int64)
+        
+        longest = np.maximum(self.lengths, len(query))
+        scores = np.ones(len(self.lengths), dtype=np.float64)
+        np.divide(shared, longest, out=scores, where=longest > 0)
+        return scores
+
+    def candidates(self, suffix: str, threshold: float) -> List[Tuple[int, float]]:
+        """(position, similarity) pairs scoring at least threshold, in dictionary order"""
+        scores = self.similarities(suffix)
+        rows = np.flatnonzero(scores >= threshold)
+        positions = self.positions[rows] if self.positions is not None else rows
+        return list(zip(positions.tolist(), scores[rows].tolist()))
+
+class TranslationGraph:
+    """Word translations compiled into one interned, bidirectional graph
+
+    Every word of a language gets an id and one translation entry mapping
+    the other languages to a translation. Entries are filled in order of
+    trust: the explicit tables, then explicit entries read backwards, then
+    one pivot through a third language (spanish -> english -> french).
+    When several words translate to the same word, the alphabetically
+    first one is its reverse translation.
+
+    Entries are shared and must not be changed by callers; the engine
+    copies them into results. update() re-reads changed table entries and
+    refreshes only the entries that can see them.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, Dict[str, str]]],
+                 languages: Sequence[str] = LANGUAGES):
+        self.languages = list(languages)
+        self._ids: Dict[str, Dict[str, int]] = {language: {} for language in self.languages}
+        self._words: Dict[str, List[str]] = {language: [] for language in self.languages}
+        # Per word id: the explicit edges out of it, and the ids (per
+        # language) whose explicit edges point at it
+        self._explicit: Dict[str, List[Dict[str, int]]] = {language: [] for language in self.languages}
+        self._incoming: Dict[str, List[Dict[str, set]]] = {language: [] for language in self.languages}
+        self._entries: Dict[str, List[Dict[str, str]]] = {language: [] for language in self.languages}
+        
+        for from_language, targets in tables.items():
+            for to_language, table in targets.items():
+                if self._linked(from_language, to_language):
+                    for word, translation in table.items():
+                        self._link(from_language, to_language, self._intern(from_language, word.lower()), translation)
+        
+        direct = self._direct_edges()
+        for language in self.languages:
+            self._entries[language] = [self._entry(language, word_id, direct)
+                                       for word_id in range(len(self._words[language]))]
+
+    def __len__(self) -> int:
+        return sum(len(words) for words in self._words.values())
+
+    def _linked(self, from_language: str, to_language: str) -> bool:
+        return from_language != to_language and from_language in self._ids and to_language in self._ids
+
+    def _intern(self, language: str, word: str) -> int:
+        ids = self._ids[language]
+        word_id = ids.get(word)
+        if word_id is None:
+            word_id = len(self._words[language])
+            self._words[language].append(word)
+            self._explicit[language].append({})
+            self._incoming[language].append({})
+            self._entries[language].append({})
+            # Published last, so lookups never see an id without an entry
+            ids[word] = word_id
+        return word_id
+
+    def _link(self, from_language: str, to_language: str, word_id: int, translation: Optional[str]):
+        """Set (or with None, drop) the explicit edge of a word into to_language"""
+        explicit = self._explicit[from_language][word_id]
+        previous = explicit.pop(to_language, None)
+        if previous is not None:
+            self._incoming[to_language][previous][from_language].discard(word_id)
+        if translation is not None:
+            translation_id = self._intern(to_language, translation)
+            explicit[to_language] = translation_id
+            self._incoming[to_language][translation_id].setdefault(from_language, set()).add(word_id)
+        return previous
+
+    def _direct_edges(self) -> Callable[[str, int], Dict[str, int]]:
+        """Memoized explicit-or-reversed edges of a word"""
+        memo = {}
+        
+        def direct(language, word_id):
+            edges = memo.get((language, word_id))
+            if edges is None:
+                edges = dict(self._explicit[language][word_id])
+                for source, word_ids in self._incoming[language][word_id].items():
+                    if source not in edges and word_ids:
+                        edges[source] = min(word_ids, key=self._words[source].__getitem__)
+                memo[language, word_id] = edges
+            return edges
+        
+        return direct
+
+    def _entry(self, language: str, word_id: int, direct) -> Dict[str, str]:
+        edges = direct(language, word_id)
+        entry = {}
+        for target in self.languages:
+            if target == language:
+                continue
+            translation_id = edges.get(target)
+            if translation_id is None:
+                # Pivots only follow direct edges, never other pivots
+                for pivot in self.languages:
+                    if pivot in edges:
+                        translation_id = direct(pivot, edges[pivot]).get(target)
+                        if translation_id is not None:
+                            break
+            if translation_id is not None:
+                entry[target] = self._words[target][translation_id]
+        return entry
+
+    def _neighbours(self, language: str, word_id: int) -> Iterator[Tuple[str, int]]:
+        yield from self._explicit[language][word_id].items()
+        for source, word_ids in self._incoming[language][word_id].items():
+            for source_id in word_ids:
+                yield source, source_id
+
+    def update(self, tables: Dict[str, Dict[str, Dict[str, str]]], from_language: str, to_language: str,
+               words: Iterable[str]):
+        """Re-read tables[from_language][to_language] for words after they changed"""
+        if not self._linked(from_language, to_language):
+            return
+        table = tables.get(from_language, {}).get(to_language, {})
+        touched = set()
+        for word in words:
+            word = word.lower()
+            word_id = self._intern(from_language, word)
+            previous = self._link(from_language, to_language, word_id, table.get(word))
+            touched.add((from_language, word_id))
+            if previous is not None:
+                touched.add((to_language, previous))
+            if to_language in self._explicit[from_language][word_id]:
+                touched.add((to_language, self._explicit[from_language][word_id][to_language]))
+        
+        # An entry reads its own direct edges and its direct neighbours'
+        # (for pivots), so only the touched words and their neighbours change
+        stale = set(touched)
+        for language, word_id in touched:
+            stale.update(self._neighbours(language, word_id))
+        direct = self._direct_edges()
+        for language, word_id in stale:
+            self._entries[language][word_id] = self._entry(language, word_id, direct)
+
+    def translate(self, word: str, from_language: str, to_language: Optional[str] = None):
+        """A word's translation into to_language, or its shared entry of all translations when to_language is None"""
+        ids = self._ids.get(from_language)
+        if ids is None:
+            return None
+        word_id = ids.get(word)
+        if word_id is None:
+            word_id = ids.get(word.lower())
+            if word_id is None:
+                return None
+        entry = self._entries[from_language][word_id]
+        if to_language is None:
+            return entry or None
+        return entry.get(to_language)
+
+class _ObservedDict(dict):
+    """dict that reports in-place changes so derived tables can be dropped"""
+
+    def __init__(self, data, on_change):
+        super().__init__((key, _observe(value, on_change)) for key, value in data.items())
+        self._on_change = on_change
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, _observe(value, self._on_change))
+        self._on_change()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._on_change()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            super().__setitem__(key, _observe(value, self._on_change))
+        self._on_change()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._on_change()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._on_change()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._on_change()
+
+    def __reduce__(self):
+        # Copies are plain tables, detached from the engine
+        return (dict, (_plain(self),))
+
+class _ObservedList(list):
+    """list that reports in-place changes so derived tables can be dropped"""
+
+    def __init__(self, data, on_change):
+        super().__init__(data)
+        self._on_change = on_change
+
+    def _changed(method):
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self._on_change()
+            return result
+        wrapper.__name__ = method.__name__
+        return wrapper
+
+    __setitem__ = _changed(list.__setitem__)
+    __delitem__ = _changed(list.__delitem__)
+    __iadd__ = _changed(list.__iadd__)
+    __imul__ = _changed(list.__imul__)
+    append = _changed(list.append)
+    extend = _changed(list.extend)
+    insert = _changed(list.insert)
+    remove = _changed(list.remove)
+    pop = _changed(list.pop)
+    clear = _changed(list.clear)
+    sort = _changed(list.sort)
+    reverse = _changed(list.reverse)
+    del _changed
+
+    def __reduce__(self):
+        return (list, (_plain(self),))
+
+def _observe(value, on_change):
+    """Wrap nested dicts and lists so any change calls on_change"""
+    if isinstance(value, dict) and not isinstance(value, _ObservedDict):
+        return _ObservedDict(value, on_change)
+    if isinstance(value, list) and not isinstance(value, _ObservedList):
+        return _ObservedList(value, on_change)
+    return value
+
+class _FrozenRhyme(NamedTuple):
+    word: str
+    phonetic: str
+    suffix: str
+    syllables: int
+    similarity: float
+    translation: object
+
+class _FrozenDict(tuple):
+    pass
+
+class _FrozenList(tuple):
+    pass
+
+def _freeze(value):
+    """Copy a result tree into immutable tuples for caching"""
+    if isinstance(value, RhymeResult):
+        return _FrozenRhyme(value.word, value.phonetic, value.suffix, value.syllables,
+                            value.similarity, _freeze(value.translation))
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    return value
+
+def _thaw(value):
+    """Rebuild a fresh, caller-owned result tree from a frozen one"""
+    if isinstance(value, _FrozenRhyme):
+        return RhymeResult(value.word, value.phonetic, value.suffix, value.syllables,
+                           value.similarity, _thaw(value.translation))
+    if isinstance(value, _FrozenDict):
+        return {key: _thaw(item) for key, item in value}
+    if isinstance(value, _FrozenList):
+        return [_thaw(item) for item in value]
+    return value
+
+def _frozen_size(value) -> int:
+    """Approximate memory held by a frozen result tree"""
+    size = sys.getsizeof(value)
+    if isinstance(value, tuple):
+        size += sum(_frozen_size(item) for item in value)
+    return size
+
+class QueryCache:
+    """Bounded LRU cache of frozen query results"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key):
+        """Return the cached value or _MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, generation: int):
+        """Store a value computed while the cache was at generation"""
+        size = _frozen_size(value)
+        with self._lock:
+            # Drop results computed from tables that changed mid-query
+            if generation != self.generation:
+                return
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Invalidate every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.generation += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+_NO_QUERY = nullcontext()
+
+class _QueryRecord:
+    __slots__ = ('stages', 'counters', 'mark')
+
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.mark = time.perf_counter()
+
+class QueryMetrics:
+    """Cumulative and per-query stage timers and counters
+
+    A query opened on a thread collects the laps and counts reported on
+    that thread until it closes; nested queries (find_rhymes inside
+    find_all_rhymes) fold into the outermost one. A lap charges the time
+    since the previous lap, or since the innermost query started, to a
+    stage, so instrumented code only pays for one call per stage.
+    """
+
+    def __init__(self, recent: int = 100):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stages: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._queries: Dict[str, List[float]] = {}
+        self._recent = deque(maxlen=recent)
+
+    @contextmanager
+    def query(self, kind: str, word: str, language: str):
+        """Collect everything reported on this thread into one query record"""
+        record = getattr(self._local, 'record', None)
+        if record is not None:
+            record.mark = time.perf_counter()
+            yield
+            return
+
+        record = self._local.record = _QueryRecord()
+        started = record.mark
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._local.record = None
+            # Fold into the shared totals once per query, not once per lap
+            with self._lock:
+                _accumulate(self._queries, kind, elapsed)
+                for name, (calls, total, longest) in record.stages.items():
+                    _accumulate(self._stages, name, total, calls, longest)
+                for name, amount in record.counters.items():
+                    self._counters[name] += amount
+                self._recent.append({
+                    'kind': kind,
+                    'word': word,
+                    'language': language,
+                    'total_ms': elapsed * 1000,
+                    'stages': {name: total * 1000 for name, (_, total, _) in record.stages.items()},
+                    'counters': dict(record.counters)
+                })
+
+    def lap(self, stage: str):
+        """Charge the time since the previous lap to stage (ignored outside a query)"""
+        now = time.perf_counter()
+        record = getattr(self._local, 'record', None)
+        if record is not None:
+            _accumulate(record.stages, stage, now - record.mark)
+            record.mark = now
+
+    def count(self, name: str, amount: int = 1):
+        record = getattr(self._local, 'record', None)
+        if record is not None:
+            record.counters[name] += amount
+        else:
+            with self._lock:
+                self._counters[name] += amount
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._stages.clear()
+        self._counters.clear()
+        self._queries.clear()
+        self._recent.clear()
+
+    def snapshot(self, reset: bool = False) -> Dict:
+        """JSON-ready copy of every timer and counter, optionally resetting them"""
+        def timers(table):
+            return {name: {'calls': int(calls), 'total_ms': total * 1000,
+                           'mean_ms': total / calls * 1000, 'max_ms': longest * 1000}
+                    for name, (calls, total, longest) in table.items()}
+
+        with self._lock:
+            snapshot = {
+                'timestamp': time.time(),
+                'queries': timers(self._queries),
+                'stages': timers(self._stages),
+                'counters': dict(self._counters),
+                'recent': list(self._recent)
+            }
+            if reset:
+                self._clear()
+        return snapshot
+
+def _accumulate(table: Dict[str, List[float]], name: str, seconds: float,
+                calls: int = 1, longest: Optional[float] = None):
+    """Add calls totalling seconds to a [calls, total, max] timer"""
+    if longest is None:
+        longest = seconds
+    entry = table.get(name)
+    if entry is None:
+        table[name] = [calls, seconds, longest]
+    else:
+        entry[0] += calls
+        entry[1] += seconds
+        if longest > entry[2]:
+            entry[2] = longest
+
+class MultilingualRhymeEngine:
+    def __init__(self, lexicon_paths: Optional[Dict[str, str]] = None):
+        self._transducers: Dict[str, PhoneticTransducer] = {}
+        self._rhyme_indexes: Dict[str, RhymeIndex] = {}
+        self._vector_scorers: Dict[str, Tuple[tuple, VectorScorer]] = {}
+        self._slant_indexes: Dict[str, SlantIndex] = {}
+        self._rhyme_families: Dict[str, RhymeFamilies] = {}
+        self._cross_language_index: Optional[CrossLanguageIndex] = None
+        self._lexicon_paths: Dict[str, str] = dict(lexicon_paths or {})
+        self._lexicons: Dict[str, MappedLexicon] = {}
+        self._snapshot: Optional[MappedSnapshot] = None
+        self._snapshot_languages: set = set()
+        # Words added to and removed from mapped languages, see add_words
+        self._lexicon_changes: Dict[str, Tuple[Dict[str, None], set]] = {}
+        self._shared: Optional[weakref.finalize] = None
+        self._translation_graph: Optional[TranslationGraph] = None
+        self._cache: Optional[QueryCache] = None
+        self._metrics: Optional[QueryMetrics] = None
+        self._update_lock = threading.RLock()
+        self._removed_words: Dict[str, set] = {}
+        
         self.current_language = 'english'
         self.phonetic_mappings = self._initialize_phonetic_mappings()
         self.word_dictionaries = self._initialize_word_dictionaries()
         self.translations = self._initialize_translations()
         self.ui_translations = self._initialize_ui_translations()
     
+    # Tables that derived structures depend on are observed, so editing them
+    # in place or replacing them drops whatever was computed from them
+    @property
+    def phonetic_mappings(self) -> Dict[str, Dict[str, str]]:
+        return self._phonetic_mappings
+    
+    @phonetic_mappings.setter
+    def phonetic_mappings(self, mappings: Dict[str, Dict[str, str]]):
+        self._phonetic_mappings = _observe(mappings, self._mappings_changed)
+        self._mappings_changed()
+    
+    @property
+    def word_dictionaries(self) -> Dict[str, List[str]]:
+        if self._removed_words:
+            self._apply_removed_words()
+        return self._word_dictionaries
+    
+    @word_dictionaries.setter
+    def word_dictionaries(self, dictionaries: Dict[str, List[str]]):
+        with self._update_lock:
+            self._removed_words = {}
+            self._word_dictionaries = _observe(dictionaries, self._dictionaries_changed)
+            self._dictionaries_changed()
+    
+    def _apply_removed_words(self):
+        """Drop words removed by remove_words from the exposed word lists"""
+        with self._update_lock:
+            for language, removed in self._removed_words.items():
+                dictionary = self._word_dictionaries[language]
+                # Bypass the observer: the index is already up to date
+                list.__setitem__(dictionary, slice(None), [word for word in dictionary if word not in removed])
+            self._removed_words = {}
+    
+    @property
+    def translations(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        return self._translations
+    
+    @translations.setter
+    def translations(self, translations: Dict[str, Dict[str, Dict[str, str]]]):
+        self._translations = _observe(translations, self._translations_changed)
+        self._translations_changed()
+    
+    def _mappings_changed(self):
+        self._transducers.clear()
+        # Mapped lexicons are re-validated against the new rules when reopened
+        self._lexicons.clear()
+        self._dictionaries_changed()
+    
+    def _dictionaries_changed(self):
+        self._rhyme_indexes.clear()
+        self._vector_scorers.clear()
+        self._slant_indexes.clear()
+        self._cross_language_index = None
+        self._translations_changed()
+    
+    def _translations_changed(self):
+        self._translation_graph = None
+        if self._cache is not None:
+            self._cache.clear()
+    
+    def enable_cache(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        """Cache query results in a bounded LRU cache"""
+        self._cache = QueryCache(max_entries, max_bytes)
+    
+    def disable_cache(self):
+        """Stop caching query results"""
+        self._cache = None
+    
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        """Get cache size and hit/miss/eviction counters (None when disabled)"""
+        return self._cache.stats() if self._cache is not None else None
+    
+    def _cached(self, key: tuple, compute):
+        """Serve a query from the cache, computing and storing it on a miss"""
+        cache = self._cache
+        if cache is None:
+            return compute()
+        
+        metrics = self._metrics
+        cached = cache.get(key)
+        if metrics is not None:
+            metrics.count('cache_hits' if cached is not _MISSING else 'cache_misses')
+        if cached is not _MISSING:
+            result = _thaw(cached)
+            if metrics is not None:
+                metrics.lap('cache')
+            return result
+        
+        if metrics is not None:
+            metrics.lap('cache')
+        generation = cache.generation
+        result = compute()
+        cache.put(key, _freeze(result), generation)
+        if metrics is not None:
+            metrics.lap('cache')
+        return result
+
+    def enable_metrics(self, recent: int = 100):
+        """Record per-stage timers and counters, keeping the last recent query records"""
+        self._metrics = QueryMetrics(recent)
+    
+    def disable_metrics(self):
+        """Stop recording metrics"""
+        self._metrics = None
+    
+    def metrics_snapshot(self, reset: bool = False) -> Optional[Dict]:
+        """Get cumulative and recent per-query metrics (None when disabled)"""
+        return self._metrics.snapshot(reset) if self._metrics is not None else None
+    
+    def _query(self, kind: str, word: str, language: str):
+        metrics = self._metrics
+        return _NO_QUERY if metrics is None else metrics.query(kind, word, language)
+    
     def _initialize_phonetic_mappings(self) -> Dict[str, Dict[str, str]]:
         return {
             'english': {
@@ -224,20 +1683,25 @@ class MultilingualRhymeEngine:
             }
         }
     
+    def _get_transducer(self, language: str) -> PhoneticTransducer:
+        """Get the compiled phonetic transducer for a language"""
+        transducer = self._transducers.get(language)
+        if transducer is None:
+            mappings = self.phonetic_mappings[language]
+            # Sort patterns by length (longest first) to avoid partial matches
+            sorted_patterns = sorted(mappings.items(), key=lambda x: len(x[0]), reverse=True)
+            transducer = PhoneticTransducer(sorted_patterns)
+            self._transducers[language] = transducer
+        return transducer
+    
     def get_phonetic_representation(self, word: str, language: str = 'english') -> str:
         """Convert word to phonetic representation"""
-        mappings = self.phonetic_mappings[language]
-        phonetic = word.lower()
-        
-        # Sort patterns by length (longest first) to avoid partial matches
-        sorted_patterns = sorted(mappings.items(), key=lambda x: len(x[0]), reverse=True)
-        
-        # Apply phonetic transformations
-        for pattern, sound in sorted_patterns:
-            if pattern and sound:
-                phonetic = re.sub(pattern, sound, phonetic)
-        
-        return phonetic
+        return self._get_transducer(language).transduce(word.lower())
+    
+    def phonetize_many(self, words: Iterable[str], language: str = 'english') -> List[str]:
+        """Convert many words to phonetic representations"""
+        transduce = self._get_transducer(language).transduce
+        return [transduce(word.lower()) for word in words]
     
     def get_rhyming_suffix(self, phonetic_word: str, min_length: int = 2) -> str:
         """Extract rhyming suffix from phonetic representation"""
@@ -246,41 +1710,13 @@ class MultilingualRhymeEngine:
     
     def count_syllables(self, word: str, language: str = 'english') -> int:
         """Count syllables in a word"""
-        lower_word = word.lower()
-        
-        if language == 'spanish':
-            vowels = re.findall(r'[aeiouáéíóúü]', lower_word)
-            if not vowels:
-                return 1
-            
-            count = len(vowels)
-            # Adjust for diphthongs
-            diphthongs = re.findall(r'[aeiou][aeiou]', lower_word)
-            if diphthongs:
-                count -= len(diphthongs)
-            return max(1, count)
-        
-        elif language == 'french':
-            vowels = re.findall(r'[aeiouyàâéèêëïîôöùûü]', lower_word)
-            if not vowels:
-                return 1
-            
-            count = len(vowels)
-            # Adjust for silent e at the end
-            if lower_word.endswith('e') and count > 1:
-                count -= 1
-            return max(1, count)
-        
-        else:  # English (default)
-            vowel_groups = re.findall(r'[aeiouy]+', lower_word)
-            if not vowel_groups:
-                return 1
-            
-            count = len(vowel_groups)
-            # Adjust for silent e
-            if lower_word.endswith('e') and count > 1:
-                count -= 1
-            return max(1, count)
+        # Languages without a counter of their own use the English rules
+        return _SYLLABLE_COUNTERS.get(language, _SYLLABLE_COUNTERS['english'])(word.lower())
+    
+    def count_syllables_many(self, words: Iterable[str], language: str = 'english') -> List[int]:
+        """Count syllables in many words"""
+        count = _SYLLABLE_COUNTERS.get(language, _SYLLABLE_COUNTERS['english'])
+        return [count(word.lower()) for word in words]
     
     def calculate_similarity(self, phonetic1: str, phonetic2: str) -> float:
         """Calculate phonetic similarity between two words"""
@@ -305,47 +1741,391 @@ class MultilingualRhymeEngine:
         
         return matches / max(len(longer), len(shorter))
     
-    def find_rhymes(self, input_word: str, language: str = 'english') -> Dict:
-        """Find rhymes for a given word"""
-        word_list = self.word_dictionaries[language]
-        input_phonetic = self.get_phonetic_representation(input_word, language)
-        input_suffix = self.get_rhyming_suffix(input_phonetic)
-        input_syllables = self.count_syllables(input_word, language)
+    def _rules_fingerprint(self, language: str) -> bytes:
+        """Digest of the phonetic rules a precomputed lexicon depends on"""
+        rules = sorted(self.phonetic_mappings[language].items())
+        return hashlib.sha1(json.dumps(rules, ensure_ascii=False).encode('utf-8')).digest()
+    
+    def build_lexicon(self, words: Iterable[str], language: str, path: str):
+        """Precompute a word list into a compact lexicon file"""
+        words = list(words)
+        phonetics = self.phonetize_many(words, language)
+        write_lexicon(
+            path,
+            language,
+            self._rules_fingerprint(language),
+            words,
+            phonetics,
+            [self.get_rhyming_suffix(phonetic) for phonetic in phonetics],
+            self.count_syllables_many(words, language)
+        )
+    
+    def attach_lexicon(self, language: str, path: str):
+        """Use a lexicon file as a language's dictionary (mapped on first use)"""
+        lexicon = self._lexicons.pop(language, None)
+        if lexicon is not None:
+            lexicon.close()
+        self._lexicon_paths[language] = path
+        self._lexicon_changes.pop(language, None)
+        self._rhyme_indexes.pop(language, None)
+        self._cross_language_index = None
+        self._words_changed()
+    
+    def _open_lexicon(self, language: str) -> Optional[MappedLexicon]:
+        """Map the lexicon file or snapshot image serving a language, if any"""
+        lexicon = self._lexicons.get(language)
+        if lexicon is not None:
+            return lexicon
         
-        perfect_rhymes = []
-        slant_rhymes = []
+        if language in self._lexicon_paths:
+            path = self._lexicon_paths[language]
+            lexicon = MappedLexicon(path)
+        elif language in self._snapshot_languages:
+            path = self._snapshot.path
+            lexicon = self._snapshot.lexicon(language)
         
-        for word in word_list:
-            if word.lower() == input_word.lower():
-                continue
-            
-            word_phonetic = self.get_phonetic_representation(word, language)
-            word_suffix = self.get_rhyming_suffix(word_phonetic)
-            word_syllables = self.count_syllables(word, language)
+        if lexicon is not None:
+            if lexicon.language != language:
+                lexicon.close()
+                raise ValueError(f'{path} is a {lexicon.language} lexicon, not {language}')
+            if lexicon.fingerprint != self._rules_fingerprint(language):
+                lexicon.close()
+                raise ValueError(f'{path} was built with different phonetic rules; rebuild it')
+            self._lexicons[language] = lexicon
+            # Expose the mapped words without invalidating the index being built
+            dict.__setitem__(self.word_dictionaries, language, lexicon.words)
+        return lexicon
+    
+    def _get_rhyme_index(self, language: str) -> RhymeIndex:
+        """Get the reverse-suffix index for a language's dictionary"""
+        index = self._rhyme_indexes.get(language)
+        if index is None:
+            # Built under the update lock so a concurrent add_words cannot
+            # land in an index that is about to be replaced
+            with self._update_lock:
+                index = self._rhyme_indexes.get(language)
+                if index is None:
+                    index = self._build_rhyme_index(language)
+                    self._rhyme_indexes[language] = index
+        return index
+    
+    def _build_rhyme_index(self, language: str) -> RhymeIndex:
+        lexicon = self._open_lexicon(language)
+        if lexicon is not None:
+            index = RhymeIndex(lexicon.words, lexicon.phonetics, lexicon.suffixes,
+                               lexicon.syllables, lexicon.order, lexicon.word_order)
+            changes = self._lexicon_changes.get(language)
+            if changes is not None:
+                # Replay the add_words/remove_words calls made on top of the mapping
+                added, removed = changes
+                index.remove(removed)
+                self._add_to_index(index, list(added), language)
+                dict.__setitem__(self.word_dictionaries, language, _LiveWords(index))
+            return index
+        
+        words = list(self.word_dictionaries[language])
+        phonetics = self.phonetize_many(words, language)
+        return RhymeIndex(
+            words,
+            phonetics,
+            [self.get_rhyming_suffix(phonetic) for phonetic in phonetics],
+            self.count_syllables_many(words, language)
+        )
+    
+    def _get_vector_scorer(self, language: str) -> VectorScorer:
+        """Get the NumPy scoring arrays for a language's dictionary"""
+        index = self._get_rhyme_index(language)
+        state = index._state
+        # A scorer is only valid for the index version it was built from
+        built = self._vector_scorers.get(language)
+        if built is not None and built[0] is state:
+            return built[1]
+        
+        if len(index) == len(index.words):
+            scorer = VectorScorer(index.suffixes)
+        else:
+            # Leave out removed words
+            positions = index.live_positions()
+            scorer = VectorScorer([index.suffixes[position] for position in positions], positions)
+        self._vector_scorers[language] = (state, scorer)
+        return scorer
+    
+    def _get_slant_index(self, language: str, max_distance: int) -> SlantIndex:
+        """Get the edit-distance index over a language's phonetic tails"""
+        index = self._get_rhyme_index(language)
+        # Valid until the index is replaced or its sorted arrays are rebuilt
+        slant_index = self._slant_indexes.get(language)
+        if (slant_index is None or slant_index.index is not index or slant_index._base is not index._state[0]
+                or slant_index.max_distance < max_distance):
+            slant_index = SlantIndex(index, max_distance)
+            self._slant_indexes[language] = slant_index
+        return slant_index
+    
+    def build_rhyme_families(self, languages: Optional[Iterable[str]] = None, min_similarity: float = 0.6):
+        """Materialize rhyme families so find_rhymes answers from direct lookups
+        
+        Queries whose suffix already occurs in the dictionary, including
+        every dictionary word, then read pre-ranked family members instead
+        of scoring candidates; queries with a new suffix, a threshold below
+        min_similarity or slant='edit' are scored as before. Families
+        follow later dictionary changes and are rebuilt lazily when the
+        index is.
+        """
+        languages = list(languages) if languages is not None else list(LANGUAGES)
+        with self._update_lock:
+            for language in languages:
+                self._rhyme_families[language] = RhymeFamilies(self._get_rhyme_index(language),
+                                                               self.calculate_similarity, min_similarity)
+    
+    def _get_rhyme_families(self, language: str) -> Optional[RhymeFamilies]:
+        families = self._rhyme_families.get(language)
+        if families is None:
+            return None
+        index = self._get_rhyme_index(language)
+        if families.index is not index or families._base is not index._state[0]:
+            families = RhymeFamilies(index, self.calculate_similarity, families.min_similarity)
+            self._rhyme_families[language] = families
+        return families
+    
+    def add_words(self, words: Iterable[str], language: str = 'english') -> int:
+        """Add words to a language's dictionary, updating its index in place
+        
+        Only the new words are phonetized. Queries running on other threads
+        see either the old or the new word set. Returns the number of words
+        added (words already in the dictionary are skipped).
+        
+        A language served from a lexicon file or snapshot keeps its mapping:
+        the new words live in memory next to it, and word_dictionaries shows
+        a read-only view of the current words. Without a word order in the
+        file (lexicons written before version 2), the first change builds a
+        word -> positions map of the whole lexicon.
+        """
+        with self._update_lock:
+            index = self._get_rhyme_index(language)
             
-            similarity = self.calculate_similarity(input_suffix, word_suffix)
+            new_words = []
+            for word in dict.fromkeys(word.strip() for word in words):
+                if word and word not in index:
+                    new_words.append(word)
+            if not new_words:
+                return 0
             
-            rhyme_data = RhymeResult(
-                word=word,
-                phonetic=word_phonetic,
-                suffix=word_suffix,
-                syllables=word_syllables,
-                similarity=similarity,
-                translation=self.get_translation(word, language)
-            )
+            self._add_to_index(index, new_words, language)
+            changes = self._lexicon_change_log(language)
+            if changes is not None:
+                changes[0].update(dict.fromkeys(new_words))
+            else:
+                # Words removed since the word list was last read are still
+                # in it; keep those entries instead of appending them again
+                pending = self._removed_words.get(language)
+                appended = new_words
+                if pending:
+                    appended = [word for word in new_words if word not in pending]
+                    pending.difference_update(new_words)
+                # Bypass the observer: the index is already up to date
+                list.extend(self._word_dictionaries[language], appended)
+            self._words_changed()
+        return len(new_words)
+    
+    def remove_words(self, words: Iterable[str], language: str = 'english') -> int:
+        """Remove words from a language's dictionary, updating its index in place
+        
+        Only the index entries of the removed words are touched; the word
+        list in word_dictionaries is filtered the next time it is read.
+        Languages served from a mapping are changed as in add_words.
+        Returns the number of distinct words removed.
+        """
+        with self._update_lock:
+            removed = set(self._get_rhyme_index(language).remove(word.strip() for word in words))
+            if not removed:
+                return 0
             
-            if similarity >= 0.9:
-                perfect_rhymes.append(rhyme_data)
-            elif similarity >= 0.6:
-                slant_rhymes.append(rhyme_data)
+            changes = self._lexicon_change_log(language)
+            if changes is not None:
+                added, removed_from_lexicon = changes
+                for word in removed:
+                    if word in added:
+                        del added[word]
+                    else:
+                        removed_from_lexicon.add(word)
+            else:
+                self._removed_words.setdefault(language, set()).update(removed)
+            self._words_changed()
+        return len(removed)
+    
+    def _add_to_index(self, index: RhymeIndex, words: List[str], language: str):
+        phonetics = self.phonetize_many(words, language)
+        index.add(
+            words,
+            phonetics,
+            [self.get_rhyming_suffix(phonetic) for phonetic in phonetics],
+            self.count_syllables_many(words, language)
+        )
+    
+    def _lexicon_change_log(self, language: str) -> Optional[Tuple[Dict[str, None], set]]:
+        """(added words, removed lexicon words) of a language served from a mapping, else None
+        
+        The log is what pickled copies replay on top of their own mapping.
+        """
+        if language not in self._lexicons:
+            return None
+        changes = self._lexicon_changes.get(language)
+        if changes is None:
+            changes = self._lexicon_changes[language] = ({}, set())
+            dict.__setitem__(self.word_dictionaries, language, _LiveWords(self._get_rhyme_index(language)))
+        return changes
+    
+    def upsert_translations(self, from_language: str, to_language: str, translations: Dict[str, str]):
+        """Add or replace word translations from one language to another"""
+        with self._update_lock:
+            table = self.translations.setdefault(from_language, {}).setdefault(to_language, {})
+            changes = {word.lower(): translation for word, translation in translations.items()}
+            # Bypasses the observer, which would drop the whole graph; only
+            # the changed words' entries are refreshed
+            dict.update(table, changes)
+            if self._translation_graph is not None:
+                self._translation_graph.update(self.translations, from_language, to_language, changes)
+            if self._cache is not None:
+                self._cache.clear()
+    
+    def _words_changed(self):
+        # Indexes were updated in place; only cached results are stale
+        if self._cache is not None:
+            self._cache.clear()
+    
+    def find_rhymes(self, input_word: str, language: str = 'english',
+                    perfect_threshold: float = 0.9, slant_threshold: Optional[float] = None,
+                    scoring: str = 'python', limit: Optional[int] = None, columnar: bool = False,
+                    slant: str = 'suffix', max_edits: int = 1, min_syllables: Optional[int] = None,
+                    max_syllables: Optional[int] = None, same_syllables: bool = False) -> Dict:
+        """Find rhymes for a given word
+        
+        scoring selects how candidates are scored: 'python' walks the
+        reverse-suffix index, 'numpy' scores the whole dictionary at once.
+        Both give identical results. limit keeps only the best N perfect and
+        the best N slant rhymes. columnar returns each list as a compact
+        RhymeResultSet instead of RhymeResult objects.
         
-        # Sort by similarity and syllable count
-        def sort_key(rhyme):
-            return (-rhyme.similarity, abs(rhyme.syllables - input_syllables))
+        slant selects how slant rhymes are found: 'suffix' scores the shared
+        phonetic tail, 'edit' returns words whose last SlantIndex.tail_length
+        phonetic characters are within max_edits edits of the input's
+        ("cat"/"cut"), scored 1 - edits / tail length. slant_threshold
+        defaults to 0.6 for 'suffix' and to none for 'edit', where max_edits
+        already bounds the slant rhymes; a threshold passed explicitly
+        applies in both modes.
         
-        perfect_rhymes.sort(key=sort_key)
-        slant_rhymes.sort(key=sort_key)
+        min_syllables and max_syllables keep only rhymes with at least and at
+        most that many syllables; same_syllables keeps only rhymes with as
+        many syllables as the input. Within a similarity, rhymes closest in syllable count
+        to the input come first. Only rhyme families (build_rhyme_families)
+        store words by syllable count and skip whole buckets outside the
+        range; otherwise every candidate of the suffix walk is read and its
+        count checked.
+        """
+        if scoring not in ('python', 'numpy'):
+            raise ValueError(f'Unknown scoring backend: {scoring}')
+        if scoring == 'numpy' and _load_numpy() is None:
+            raise ImportError('NumPy is required for scoring="numpy"')
+        if slant not in ('suffix', 'edit'):
+            raise ValueError(f'Unknown slant mode: {slant}')
+        if max_edits < 0:
+            raise ValueError('max_edits must not be negative')
+        if min_syllables is not None and max_syllables is not None and min_syllables > max_syllables:
+            raise ValueError('min_syllables must not exceed max_syllables')
+        
+        if slant_threshold is None:
+            slant_threshold = 0.6 if slant == 'suffix' else 0.0
+        
+        key = ('rhymes', input_word.lower(), language, perfect_threshold, slant_threshold, limit, columnar)
+        if slant == 'edit':
+            key += (slant, max_edits)
+        if min_syllables is not None or max_syllables is not None or same_syllables:
+            key += ('syllables', min_syllables, max_syllables, same_syllables)
+        with self._query('find_rhymes', input_word, language):
+            rhymes = self._cached(key, lambda: self._find_rhymes(
+                input_word, language, perfect_threshold, slant_threshold, scoring, limit, columnar,
+                slant, max_edits, min_syllables, max_syllables, same_syllables))
+        rhymes['input_analysis']['word'] = input_word
+        return rhymes
+    
+    def _find_rhymes(self, input_word: str, language: str, perfect_threshold: float, slant_threshold: float,
+                     scoring: str = 'python', limit: Optional[int] = None, columnar: bool = False,
+                     slant: str = 'suffix', max_edits: int = 1, min_syllables: Optional[int] = None,
+                     max_syllables: Optional[int] = None, same_syllables: bool = False) -> Dict:
+        metrics = self._metrics
+        input_phonetic = self.get_phonetic_representation(input_word, language)
+        input_suffix = self.get_rhyming_suffix(input_phonetic)
+        if metrics is not None:
+            metrics.lap('phonetize')
+        input_syllables = self.count_syllables(input_word, language)
+        syllable_range = _syllable_range(input_syllables, min_syllables, max_syllables, same_syllables)
+        if metrics is not None:
+            metrics.lap('syllables')
+        # Edit-distance slant rhymes come from their own index below
+        threshold = min(perfect_threshold, slant_threshold) if slant == 'suffix' else perfect_threshold
         
+        index = self._get_rhyme_index(language)
+        families = self._get_rhyme_families(language) if self._rhyme_families and slant == 'suffix' else None
+        ranked = None
+        if families is not None:
+            ranked = families.ranked(input_suffix, input_syllables, perfect_threshold, slant_threshold, input_word,
+                                     syllable_range)
+        if ranked is not None:
+            if metrics is not None:
+                metrics.lap('candidates')
+            perfect_rows, slant_rows = (list(rows) if limit is None else list(islice(rows, limit))
+                                        for rows in ranked)
+            if metrics is not None:
+                metrics.count('candidates_accepted', len(perfect_rows) + len(slant_rows))
+                metrics.lap('ranking')
+            perfect_rhymes, slant_rhymes = self._build_rhymes(language, index, perfect_rows, slant_rows, columnar)
+            return self._rhymes_result(input_word, input_phonetic, input_suffix, input_syllables,
+                                       perfect_rhymes, slant_rhymes)
+        
+        if scoring == 'numpy':
+            # Lookup and scoring are one vectorized step here
+            scored = self._get_vector_scorer(language).candidates(input_suffix, threshold)
+            if metrics is not None:
+                metrics.lap('scoring')
+        else:
+            positions = index.candidates(input_suffix, threshold)
+            if syllable_range is not None:
+                low, high = syllable_range
+                syllables = index.syllables
+                positions = [position for position in positions if low <= syllables[position] <= high]
+            if metrics is not None:
+                metrics.lap('candidates')
+            scored = [(position, self.calculate_similarity(input_suffix, index.suffixes[position]))
+                      for position in positions]
+            if metrics is not None:
+                metrics.lap('scoring')
+        
+        if slant == 'edit':
+            perfect = {position for position, similarity in scored if similarity >= perfect_threshold}
+            neighbours = self._get_slant_index(language, max_edits).neighbours(input_phonetic, max_edits)
+            if metrics is not None:
+                metrics.lap('candidates')
+            input_tail = input_phonetic[-SlantIndex.tail_length:]
+            slant_scored = []
+            for position, distance in neighbours:
+                if position not in perfect:
+                    tail_length = max(len(input_tail), len(index.phonetics[position][-SlantIndex.tail_length:]))
+                    slant_scored.append((position, 1 - distance / tail_length if tail_length else 1.0))
+            # Both lists are in dictionary order; ranking relies on that
+            scored = list(heapq.merge([(position, similarity) for position, similarity in scored
+                                       if position in perfect], slant_scored))
+            if metrics is not None:
+                metrics.lap('scoring')
+        
+        perfect_rhymes, slant_rhymes = self._rank_rhymes(
+            language, index, input_word, input_syllables, scored,
+            perfect_threshold, slant_threshold, limit, columnar, syllable_range)
+        return self._rhymes_result(input_word, input_phonetic, input_suffix, input_syllables,
+                                   perfect_rhymes, slant_rhymes)
+    
+    @staticmethod
+    def _rhymes_result(input_word: str, input_phonetic: str, input_suffix: str, input_syllables: int,
+                       perfect_rhymes, slant_rhymes) -> Dict:
         return {
             'perfect': perfect_rhymes,
             'slant': slant_rhymes,
@@ -357,33 +2137,343 @@ class MultilingualRhymeEngine:
             }
         }
     
-    def find_cross_language_rhymes(self, input_word: str, input_language: str) -> Dict:
-        """Find cross-language rhymes"""
+    def _rank_rhymes(self, language: str, index: RhymeIndex, input_word: str, input_syllables: int,
+                     scored: Sequence[Tuple[int, float]], perfect_threshold: float, slant_threshold: float,
+                     limit: Optional[int], columnar: bool,
+                     syllable_range: Optional[Tuple[int, int]] = None) -> Tuple:
+        """Split scored candidates into ranked perfect and slant results"""
+        input_lower = input_word.lower()
+        low, high = syllable_range or (0, sys.maxsize)
+        syllables = index.syllables
+        
+        # Bucket candidates by similarity, then by syllable count, and walk
+        # the buckets outward from the input's count: rows come out ranked
+        # without sorting them all, and a limited query stops early. Only
+        # the rows that are returned become RhymeResults with translations.
+        # Position breaks ties so the order matches a stable sort of the
+        # dictionary.
+        perfect_levels = {}
+        slant_levels = {}
+        accepted = 0
+        
+        for position, similarity in scored:
+            if similarity >= perfect_threshold:
+                levels = perfect_levels
+            elif similarity >= slant_threshold:
+                levels = slant_levels
+            else:
+                continue
+            
+            count = syllables[position]
+            if not low <= count <= high or index.words[position].lower() == input_lower:
+                continue
+            
+            levels.setdefault(similarity, {}).setdefault(count, []).append(position)
+            accepted += 1
+        
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.count('candidates_scanned', len(scored))
+            metrics.count('candidates_accepted', accepted)
+        
+        perfect_rows = list(islice(_ranked_rows(perfect_levels, input_syllables), limit))
+        slant_rows = list(islice(_ranked_rows(slant_levels, input_syllables), limit))
+        if metrics is not None:
+            metrics.lap('ranking')
+        return self._build_rhymes(language, index, perfect_rows, slant_rows, columnar)
+    
+    def _build_rhymes(self, language: str, index: RhymeIndex, perfect_rows: List[tuple], slant_rows: List[tuple],
+                      columnar: bool) -> Tuple:
+        """Turn ranked (-similarity, syllable distance, position) rows into results"""
+        metrics = self._metrics
+        
+        def build(row):
+            negated_similarity, _, position = row
+            word = index.words[position]
+            return RhymeResult(
+                word=word,
+                phonetic=index.phonetics[position],
+                suffix=index.suffixes[position],
+                syllables=index.syllables[position],
+                similarity=-negated_similarity,
+                translation=self.get_translation(word, language)
+            )
+        
+        def build_set(rows):
+            return RhymeResultSet(
+                language,
+                index,
+                [position for _, _, position in rows],
+                [-negated_similarity for negated_similarity, _, _ in rows],
+                [index.syllables[position] for _, _, position in rows],
+                partial(self.get_translation, from_language=language)
+            )
+        
+        if columnar:
+            perfect_rhymes = build_set(perfect_rows)
+            slant_rhymes = build_set(slant_rows)
+        else:
+            perfect_rhymes = [build(row) for row in perfect_rows]
+            slant_rhymes = [build(row) for row in slant_rows]
+        # Columnar sets defer translations until rows are read, so for them
+        # this lap only covers building the arrays
+        if metrics is not None:
+            metrics.lap('translation')
+        
+        return perfect_rhymes, slant_rhymes
+    
+    def find_cross_language_rhymes(self, input_word: str, input_language: str, limit: Optional[int] = None,
+                                   columnar: bool = False, perfect_threshold: float = 0.9,
+                                   slant_threshold: float = 0.6, min_syllables: Optional[int] = None,
+                                   max_syllables: Optional[int] = None, same_syllables: bool = False) -> Dict:
+        """Find cross-language rhymes
+        
+        The syllable filters behave as in find_rhymes, counting the input's
+        syllables with each target language's rules.
+        """
+        if min_syllables is not None and max_syllables is not None and min_syllables > max_syllables:
+            raise ValueError('min_syllables must not exceed max_syllables')
+        key = ('cross', input_word.lower(), input_language, limit, columnar, perfect_threshold, slant_threshold)
+        if min_syllables is not None or max_syllables is not None or same_syllables:
+            key += ('syllables', min_syllables, max_syllables, same_syllables)
+        with self._query('find_cross_language_rhymes', input_word, input_language):
+            cross_rhymes = self._cached(key, lambda: self._find_cross_language_rhymes(
+                input_word, input_language, limit, columnar, perfect_threshold, slant_threshold,
+                min_syllables, max_syllables, same_syllables))
+        for rhymes in cross_rhymes.values():
+            rhymes['input_analysis']['word'] = input_word
+        return cross_rhymes
+    
+    def _get_cross_language_index(self) -> 'CrossLanguageIndex':
+        """Get the shared reverse-suffix index over every language's dictionary"""
+        if self._cross_language_index is None:
+            self._cross_language_index = CrossLanguageIndex({language: self._get_rhyme_index(language)
+                                                             for language in LANGUAGES})
+        return self._cross_language_index
+    
+    def _find_cross_language_rhymes(self, input_word: str, input_language: str, limit: Optional[int] = None,
+                                    columnar: bool = False, perfect_threshold: float = 0.9,
+                                    slant_threshold: float = 0.6, min_syllables: Optional[int] = None,
+                                    max_syllables: Optional[int] = None, same_syllables: bool = False) -> Dict:
         cross_rhymes = {}
-        languages = [lang for lang in ['english', 'spanish', 'french'] if lang != input_language]
+        languages = [lang for lang in LANGUAGES if lang != input_language]
+        threshold = min(perfect_threshold, slant_threshold)
+        
+        metrics = self._metrics
+        
+        # The input is still read with each target language's rules, but
+        # targets that yield the same suffix share a single index walk
+        input_phonetics = dict(zip(languages, (self.get_phonetic_representation(input_word, language)
+                                               for language in languages)))
+        input_suffixes = {language: self.get_rhyming_suffix(input_phonetics[language]) for language in languages}
+        if metrics is not None:
+            metrics.lap('phonetize')
+        cross_index = self._get_cross_language_index()
+        hits = {}
+        for suffix in set(input_suffixes.values()):
+            targets = [language for language in languages if input_suffixes[language] == suffix]
+            hits.update(cross_index.candidates(suffix, threshold, targets))
+        if metrics is not None:
+            metrics.lap('candidates')
         
         for target_language in languages:
-            rhymes = self.find_rhymes(input_word, target_language)
-            if rhymes['perfect'] or rhymes['slant']:
-                cross_rhymes[target_language] = rhymes
+            index = cross_index.indexes[target_language]
+            input_suffix = input_suffixes[target_language]
+            input_syllables = self.count_syllables(input_word, target_language)
+            syllable_range = _syllable_range(input_syllables, min_syllables, max_syllables, same_syllables)
+            if metrics is not None:
+                metrics.lap('syllables')
+            positions = hits[target_language]
+            if syllable_range is not None:
+                low, high = syllable_range
+                syllables = index.syllables
+                positions = [position for position in positions if low <= syllables[position] <= high]
+            scored = [(position, self.calculate_similarity(input_suffix, index.suffixes[position]))
+                      for position in positions]
+            if metrics is not None:
+                metrics.lap('scoring')
+            
+            perfect_rhymes, slant_rhymes = self._rank_rhymes(
+                target_language, index, input_word, input_syllables, scored,
+                perfect_threshold, slant_threshold, limit, columnar, syllable_range)
+            
+            if len(perfect_rhymes) or len(slant_rhymes):
+                cross_rhymes[target_language] = {
+                    'perfect': perfect_rhymes,
+                    'slant': slant_rhymes,
+                    'input_analysis': {
+                        'word': input_word,
+                        'phonetic': input_phonetics[target_language],
+                        'suffix': input_suffix,
+                        'syllables': input_syllables
+                    }
+                }
         
         return cross_rhymes
     
     def get_translation(self, word: str, from_language: str, to_language: str = None) -> Optional[Dict[str, str]]:
-        """Get translation of a word"""
-        if to_language is None:
-            # Return all available translations
-            translations = {}
-            available_languages = [lang for lang in ['english', 'spanish', 'french'] if lang != from_language]
+        """Get translation of a word
+        
+        Words missing from a direct table are answered from the reverse
+        table or through a pivot language; see TranslationGraph.
+        """
+        translation = self._get_translation_graph().translate(word, from_language, to_language)
+        # Graph entries are shared; every caller and result gets its own copy
+        return dict(translation) if isinstance(translation, dict) else translation
+    
+    def _get_translation_graph(self) -> TranslationGraph:
+        graph = self._translation_graph
+        if graph is None:
+            # Built under the update lock so upsert_translations cannot
+            # change the tables halfway through
+            with self._update_lock:
+                graph = self._translation_graph
+                if graph is None:
+                    graph = self._translation_graph = TranslationGraph(self.translations)
+        return graph
+    
+    def load_translations(self, path: str) -> int:
+        """Merge a JSON export of data/enhanced-translations.ts into the translation tables
+        
+        Returns the number of entries read.
+        """
+        tables = read_json_translations(path)
+        with self._update_lock:
+            for from_language, targets in tables.items():
+                for to_language, table in targets.items():
+                    self.upsert_translations(from_language, to_language, table)
+        return sum(len(table) for targets in tables.values() for table in targets.values())
+    
+    def warm_up(self, languages: Optional[Iterable[str]] = None):
+        """Build the phonetic transducers and rhyme indexes ahead of the first query"""
+        languages = list(languages) if languages is not None else list(LANGUAGES)
+        for language in languages:
+            self._get_transducer(language)
+            self._get_rhyme_index(language)
+        if set(languages) >= set(LANGUAGES):
+            self._get_cross_language_index()
+    
+    def save_snapshot(self, path: str, languages: Optional[Iterable[str]] = None):
+        """Save the engine's tables and precomputed lexicons to one binary file
+        
+        Every language's phonetics, suffixes, syllable counts and suffix
+        order are stored, so load_snapshot has nothing left to derive. Languages left out of
+        languages that are served from lexicon files or another snapshot
+        are not copied; loaders map those files themselves.
+        """
+        languages = list(languages) if languages is not None else list(LANGUAGES)
+        lexicons = {}
+        for language in languages:
+            index = self._get_rhyme_index(language)
+            positions = index.live_positions()
+            lexicons[language] = (
+                self._rules_fingerprint(language),
+                [index.words[position] for position in positions],
+                [index.phonetics[position] for position in positions],
+                [index.suffixes[position] for position in positions],
+                [index.syllables[position] for position in positions]
+            )
+        
+        # Languages mapped from elsewhere stay with their lexicon files,
+        # as in __getstate__, instead of being copied into the tables
+        mapped = self._snapshot_languages | self._lexicon_paths.keys()
+        tables = {
+            'current_language': self.current_language,
+            'phonetic_mappings': _plain(self.phonetic_mappings),
+            'word_dictionaries': {language: _plain(words) for language, words in self.word_dictionaries.items()
+                                  if language not in lexicons and language not in mapped},
+            'translations': _plain(self.translations),
+            'ui_translations': self.ui_translations
+        }
+        write_snapshot(path, tables, lexicons)
+    
+    @classmethod
+    def load_snapshot(cls, path: str) -> 'MultilingualRhymeEngine':
+        """Create an engine from a save_snapshot file
+        
+        Only the header and tables are read up front. Lexicon images are
+        mapped in place, and each language's index and transducer are set
+        up the first time that language is queried.
+        """
+        snapshot = MappedSnapshot(path)
+        tables = snapshot.tables
+        engine = cls()
+        engine.current_language = tables['current_language']
+        engine.phonetic_mappings = tables['phonetic_mappings']
+        engine.word_dictionaries.update(tables['word_dictionaries'])
+        engine.translations = tables['translations']
+        engine.ui_translations = tables['ui_translations']
+        engine._attach_snapshot(snapshot)
+        return engine
+    
+    def _attach_snapshot(self, snapshot: MappedSnapshot, languages: Optional[Iterable[str]] = None):
+        self._snapshot = snapshot
+        self._snapshot_languages = set(snapshot.languages if languages is None else languages)
+        self._mappings_changed()
+        for language in self._snapshot_languages:
+            self._open_lexicon(language)
+    
+    def share(self, path: Optional[str] = None) -> str:
+        """Move the in-memory dictionaries into a snapshot that other processes map read-only
+        
+        The snapshot is written to path, or to a new file in /dev/shm when
+        available, and this engine then serves those languages from the
+        mapping itself. Pickled copies (process-pool workers of
+        iter_batch_rhymes) and forked children attach to the same pages
+        instead of holding their own copy. Languages served from lexicon
+        files are already shared and are left as they are, unless words
+        were added or removed since.
+        
+        This engine owns the file and removes it in close() or when it is
+        garbage collected. Engines that attached before then keep working,
+        since their mapping outlives the file name; new ones cannot attach.
+        Returns the snapshot path.
+        """
+        with self._update_lock:
+            if path is None:
+                directory = '/dev/shm' if os.access('/dev/shm', os.W_OK) else None
+                fd, path = tempfile.mkstemp(prefix='rhymes-', suffix='.rsnap', dir=directory)
+                os.close(fd)
             
-            for lang in available_languages:
-                translation = self.translations.get(from_language, {}).get(lang, {}).get(word.lower())
-                if translation:
-                    translations[lang] = translation
+            # Lexicon files that were changed since they were mapped go into
+            # the snapshot with their changes
+            languages = [language for language in LANGUAGES
+                         if language not in self._lexicon_paths or language in self._lexicon_changes]
+            try:
+                self.save_snapshot(path, languages)
+                snapshot = MappedSnapshot(path)
+            except BaseException:
+                _remove_shared(path, os.getpid())
+                raise
             
-            return translations if translations else None
+            for language in languages:
+                self._lexicon_paths.pop(language, None)
+                self._lexicon_changes.pop(language, None)
+            previous = self._shared
+            self._attach_snapshot(snapshot)
+            self._shared = weakref.finalize(self, _remove_shared, path, os.getpid())
+            if previous is not None:
+                previous()
+            return path
+    
+    def close(self):
+        """Release mapped lexicons and snapshots, removing the file made by share()
         
-        return self.translations.get(from_language, {}).get(to_language, {}).get(word.lower())
+        Languages served from a mapping cannot be queried afterwards.
+        """
+        with self._update_lock:
+            for language, lexicon in self._lexicons.items():
+                if language in self._lexicon_paths:
+                    lexicon.close()
+            self._lexicons.clear()
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+            self._snapshot_languages = set()
+            if self._shared is not None:
+                self._shared()
+                self._shared = None
+            self._dictionaries_changed()
     
     def get_ui_text(self, key: str) -> str:
         """Get UI text in current language"""
@@ -391,22 +2481,47 @@ class MultilingualRhymeEngine:
     
     def set_language(self, language: str):
         """Set current UI language"""
-        if language in ['english', 'spanish', 'french']:
+        if language in LANGUAGES:
             self.current_language = language
     
-    def find_all_rhymes(self, input_word: str, language: str = 'english') -> Dict:
+    def find_all_rhymes(self, input_word: str, language: str = 'english', limit: Optional[int] = None,
+                        columnar: bool = False) -> Dict:
         """Main function to find all types of rhymes"""
-        print(f"\n=== {self.get_ui_text('title')} ===")
-        print(f"Finding rhymes for: \"{input_word}\" ({language})")
-        
-        # Find rhymes in the same language
-        same_language_rhymes = self.find_rhymes(input_word, language)
+        with self._query('find_all_rhymes', input_word, language):
+            metrics = self._metrics
+            print(f"\n=== {self.get_ui_text('title')} ===")
+            print(f"Finding rhymes for: \"{input_word}\" ({language})")
+            if metrics is not None:
+                metrics.lap('display')
+            
+            results = self.collect_all_rhymes(input_word, language, limit, columnar)
+            
+            # Display results
+            self.display_results(input_word, language, results['same_language'], results['cross_language'])
+            if metrics is not None:
+                metrics.lap('display')
         
-        # Find cross-language rhymes
-        cross_language_rhymes = self.find_cross_language_rhymes(input_word, language)
+        return results
+    
+    def collect_all_rhymes(self, input_word: str, language: str = 'english', limit: Optional[int] = None,
+                           columnar: bool = False, perfect_threshold: float = 0.9, slant_threshold: float = 0.6,
+                           cross: bool = True, **syllable_filters) -> Dict:
+        """Find all types of rhymes without printing anything
         
-        # Display results
-        self.display_results(input_word, language, same_language_rhymes, cross_language_rhymes)
+        syllable_filters (min_syllables, max_syllables, same_syllables)
+        behave as in find_rhymes.
+        """
+        with self._query('collect_all_rhymes', input_word, language):
+            # Find rhymes in the same language
+            same_language_rhymes = self.find_rhymes(input_word, language, perfect_threshold, slant_threshold,
+                                                     limit=limit, columnar=columnar, **syllable_filters)
+            
+            # Find cross-language rhymes
+            cross_language_rhymes = {}
+            if cross:
+                cross_language_rhymes = self.find_cross_language_rhymes(input_word, language, limit, columnar,
+                                                                        perfect_threshold, slant_threshold,
+                                                                        **syllable_filters)
         
         return {
             'same_language': same_language_rhymes,
@@ -433,8 +2548,6 @@ class MultilingualRhymeEngine:
                 translation = f" ({', '.join(rhyme.translation.values())})" if rhyme.translation else ''
                 print(f"{i}. {rhyme.word}{translation} - {rhyme.syllables} {self.get_ui_text('syllables')} - {rhyme.similarity*100:.1f}% {self.get_ui_text('confidence')}")
         
-        print(f"\n--- {self.get_ui_")
-        
         print(f"\n--- {self.get_ui_text('slant_rhymes')} ({language}) ---")
         if not same_language_rhymes['slant']:
             print(self.get_ui_text('no_rhymes'))
@@ -463,7 +2576,7 @@ class MultilingualRhymeEngine:
                         translation = f" ({', '.join(rhyme.translation.values())})" if rhyme.translation else ''
                         print(f"    {i}. {rhyme.word}{translation} - {rhyme.similarity*100:.1f}%")
     
-    def batch_find_rhymes(self, words: List[str], language: str = 'english') -> Dict:
+    def batch_find_rhymes(self, words: List[str], language: str = 'english', columnar: bool = False) -> Dict:
         """Batch process multiple words"""
         results = {}
         
@@ -471,36 +2584,235 @@ class MultilingualRhymeEngine:
         
         for i, word in enumerate(words):
             print(f"\nProcessing {i+1}/{len(words)}: {word}")
-            results[word] = self.find_all_rhymes(word, language)
+            results[word] = self.find_all_rhymes(word, language, columnar=columnar)
         
         return results
     
-    def export_results(self, results: Dict, filename: str = 'rhyme_results.json'):
-        """Export results to JSON"""
-        # Convert RhymeResult objects to dictionaries for JSON serialization
-        def convert_rhyme_result(obj):
-            if isinstance(obj, RhymeResult):
-                return {
-                    'word': obj.word,
-                    'phonetic': obj.phonetic,
-                    'suffix': obj.suffix,
-                    'syllables': obj.syllables,
-                    'similarity': obj.similarity,
-                    'translation': obj.translation
-                }
-            elif isinstance(obj, list):
-                return [convert_rhyme_result(item) for item in obj]
-            elif isinstance(obj, dict):
-                return {key: convert_rhyme_result(value) for key, value in obj.items()}
-            else:
-                return obj
+    def iter_batch_rhymes(self, words: Iterable[Union[str, Tuple[str, str]]], language: str = 'english',
+                          workers: Optional[int] = None, chunk_size: int = 64, ordered: bool = True,
+                          limit: Optional[int] = None, columnar: bool = False,
+                          progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                          **options) -> Iterator[Tuple[Union[str, Tuple[str, str]], Dict]]:
+        """Quietly find all rhymes for many words, yielding (word, results) pairs
+        
+        Words are read lazily and processed in chunks on a process pool
+        (workers defaults to the CPU count; workers <= 1 runs in this process).
+        A (word, language) pair in place of a word overrides language for
+        that word and is yielded back as given. Results come back in input
+        order, or as chunks finish when ordered is False. limit and columnar
+        behave as in find_rhymes; other options (perfect_threshold,
+        slant_threshold, cross and the syllable filters) are passed to
+        collect_all_rhymes. progress is
+        called with (words done, total words or None).
         
-        serializable_results = convert_rhyme_result(results)
+        Each worker receives a pickled copy of the engine; after share() that
+        copy maps the shared snapshot instead of re-indexing the dictionaries.
+        """
+        total = len(words) if isinstance(words, Sized) else None
+        chunks = _chunked(iter(words), chunk_size)
+        done = 0
         
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            for chunk in chunks:
+                yield from _collect_chunk(self, chunk, language, limit, columnar, options)
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+            return
+        
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(self,))
+        try:
+            pending = {}
+            finished = {}
+            next_chunk = 0
+            submitted = 0
+            
+            def submit():
+                nonlocal submitted
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return False
+                pending[executor.submit(_batch_worker_chunk, chunk, language, limit, columnar, options)] = submitted
+                submitted += 1
+                return True
+            
+            # Keep a bounded number of chunks in flight so input and output
+            # never have to fit in memory at once
+            while len(pending) < workers * 2 and submit():
+                pass
+            
+            while pending:
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    finished[pending.pop(future)] = future.result()
+            
+                if ordered:
+                    ready = []
+                    while next_chunk in finished:
+                        ready.append(finished.pop(next_chunk))
+                        next_chunk += 1
+                else:
+                    ready = list(finished.values())
+                    finished.clear()
+            
+                for chunk_results in ready:
+                    yield from chunk_results
+                    done += len(chunk_results)
+                    if progress is not None:
+                        progress(done, total)
+            
+                while len(pending) < workers * 2 and submit():
+                    pass
+        finally:
+            # Stopping the generator early drops chunks that have not started
+            executor.shutdown(cancel_futures=True)
+    
+    def __getstate__(self) -> Dict:
+        # Ship the source tables; workers rebuild derived structures lazily
+        # and map lexicon files and snapshots themselves
+        mapped = self._snapshot_languages | self._lexicon_paths.keys()
+        dictionaries = {language: _plain(words) for language, words in self.word_dictionaries.items()
+                        if language not in mapped}
+        return {
+            'current_language': self.current_language,
+            'phonetic_mappings': _plain(self.phonetic_mappings),
+            'word_dictionaries': dictionaries,
+            'translations': _plain(self.translations),
+            'ui_translations': self.ui_translations,
+            'lexicon_paths': dict(self._lexicon_paths),
+            'lexicon_changes': {language: (list(added), sorted(removed))
+                                for language, (added, removed) in self._lexicon_changes.items()},
+            'snapshot': (self._snapshot.path, sorted(self._snapshot_languages)) if self._snapshot is not None else None,
+            'cache': (self._cache.max_entries, self._cache.max_bytes) if self._cache is not None else None,
+            'rhyme_families': {language: families.min_similarity for language, families in self._rhyme_families.items()}
+        }
+    
+    def __setstate__(self, state: Dict):
+        self.__init__(state['lexicon_paths'])
+        self.current_language = state['current_language']
+        self.phonetic_mappings = state['phonetic_mappings']
+        self.word_dictionaries.update(state['word_dictionaries'])
+        self.translations = state['translations']
+        self.ui_translations = state['ui_translations']
+        self._lexicon_changes = {language: (dict.fromkeys(added), set(removed))
+                                 for language, (added, removed) in state['lexicon_changes'].items()}
+        if state['snapshot'] is not None:
+            path, languages = state['snapshot']
+            self._attach_snapshot(MappedSnapshot(path), languages)
+        if state['cache'] is not None:
+            self.enable_cache(*state['cache'])
+        for language, min_similarity in state['rhyme_families'].items():
+            self.build_rhyme_families([language], min_similarity)
+    
+    def export_results(self, results: Dict, filename: str = 'rhyme_results.json', compact: bool = False):
+        """Export results to JSON"""
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(serializable_results, f, indent=2, ensure_ascii=False)
+            if compact:
+                json.dump(results, f, separators=(',', ':'), ensure_ascii=False, default=_rhyme_result_fields)
+            else:
+                json.dump(results, f, indent=2, ensure_ascii=False, default=_rhyme_result_fields)
         
         print(f"Results exported to {filename}")
+    
+    def export_results_jsonl(self, results: Union[Dict, Iterable[Tuple[str, Dict]]], filename: str = 'rhyme_results.jsonl',
+                             compress: bool = False, compact: bool = True) -> int:
+        """Stream results to a JSON Lines file, one record per input word
+        
+        results may be a word -> results dict or the (word, results) pairs
+        yielded by iter_batch_rhymes; records are written as they arrive.
+        Returns the number of records written.
+        """
+        if isinstance(results, dict):
+            results = results.items()
+        separators = (',', ':') if compact else (', ', ': ')
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=separators, default=_rhyme_result_fields)
+        
+        count = 0
+        with _open_text(filename, 'w', compress) as f:
+            for word, word_results in results:
+                for chunk in encoder.iterencode({'word': word, 'results': word_results}):
+                    f.write(chunk)
+                f.write('\n')
+                count += 1
+        return count
+
+def _rhyme_result_fields(obj):
+    """JSON fallback that serializes RhymeResult objects without copying the tree"""
+    if isinstance(obj, RhymeResult):
+        return obj.__dict__
+    if isinstance(obj, FrozenRhymeResult):
+        return {name: getattr(obj, name) for name in FrozenRhymeResult.__slots__}
+    if isinstance(obj, RhymeResultSet):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _open_text(filename: str, mode: str, compress: bool):
+    if compress:
+        return gzip.open(filename, mode + 't', encoding='utf-8')
+    return open(filename, mode, encoding='utf-8')
+
+
+def read_results_jsonl(filename: str) -> Iterator[Tuple[str, Dict]]:
+    """Stream (word, results) records back from export_results_jsonl output"""
+    with open(filename, 'rb') as f:
+        compressed = f.read(2) == b'\x1f\x8b'
+    
+    with _open_text(filename, 'r', compressed) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record['word'], record['results']
+
+
+def _plain(value):
+    """Copy observed tables back into plain dicts and lists"""
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _chunked(items: Iterator[str], size: int) -> Iterator[List[str]]:
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _remove_shared(path: str, owner: int):
+    # Forked children inherit the finalizer but not ownership of the file
+    if os.getpid() == owner:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_batch_engine: Optional[MultilingualRhymeEngine] = None
+
+
+def _init_batch_worker(engine: MultilingualRhymeEngine):
+    global _batch_engine
+    _batch_engine = engine
+
+
+def _collect_chunk(engine: MultilingualRhymeEngine, words: List[Union[str, Tuple[str, str]]], language: str,
+                   limit: Optional[int], columnar: bool, options: Dict) -> List[Tuple[Union[str, Tuple[str, str]], Dict]]:
+    results = []
+    for item in words:
+        word, word_language = (item, language) if isinstance(item, str) else item
+        results.append((item, engine.collect_all_rhymes(word, word_language, limit, columnar, **options)))
+    return results
+
+
+def _batch_worker_chunk(words: List[Union[str, Tuple[str, str]]], language: str, limit: Optional[int],
+                        columnar: bool, options: Dict) -> List[Tuple[Union[str, Tuple[str, str]], Dict]]:
+    return _collect_chunk(_batch_engine, words, language, limit, columnar, options)
 
 
 def run_examples():
@@ -539,32 +2851,131 @@ def run_examples():
     return rhyme_engine
 
 
-if __name__ == "__main__":
-    # Run the examples
-    engine = run_examples()
-    
-    # Interactive mode
-    print('\n' + '='*50)
-    print('Interactive Mode - Enter words to find rhymes (type "quit" to exit)')
-    
-    while True:
+_CSV_FIELDS = ['word', 'language', 'rhyme_language', 'type', 'rank', 'rhyme', 'phonetic', 'suffix', 'syllables',
+               'similarity', 'translation']
+
+
+def add_engine_arguments(parser):
+    """Add the engine set-up flags shared by the command-line tools"""
+    parser.add_argument('--lexicon', action='append', default=[], metavar='LANGUAGE=PATH',
+                        help='serve a language from a compact lexicon file')
+    parser.add_argument('--snapshot', help='start from an engine snapshot written by save_snapshot')
+    parser.add_argument('--translations', help='JSON export of data/enhanced-translations.ts to load')
+    parser.add_argument('--rhyme-families', action='store_true',
+                        help='materialize rhyme families at start-up for direct lookups')
+
+
+def engine_from_arguments(args) -> MultilingualRhymeEngine:
+    """Build an engine from the flags added by add_engine_arguments"""
+    lexicons = dict(item.split('=', 1) for item in args.lexicon)
+    if args.snapshot:
+        engine = MultilingualRhymeEngine.load_snapshot(args.snapshot)
+        for language, path in lexicons.items():
+            engine.attach_lexicon(language, path)
+    else:
+        engine = MultilingualRhymeEngine(lexicon_paths=lexicons)
+    if args.translations:
+        engine.load_translations(args.translations)
+    if args.rhyme_families:
+        engine.build_rhyme_families()
+    return engine
+
+
+def _read_words(paths: Iterable[str], language: str) -> Iterator[Tuple[str, str]]:
+    """(word, language) pairs from files of words or 'word<TAB>language' / 'word,language' lines
+
+    '-' reads stdin. Lines naming an unsupported language are reported on
+    stderr and skipped.
+    """
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path, encoding='utf-8', errors='replace')
         try:
-            word = input('\nEnter a word: ').strip()
-            if word.lower() == 'quit':
-                break
-            
-            if not word:
-                continue
-            
-            language = input('Enter language (english/spanish/french) [english]: ').strip().lower()
-            if language not in ['english', 'spanish', 'french']:
-                language = 'english'
-            
-            engine.set_language(language)
-            engine.find_all_rhymes(word, language)
-            
-        except KeyboardInterrupt:
-            print('\nGoodbye!')
-            break
-        except Exception as e:
-            print(f'Error: {e}')
+            for number, line in enumerate(f, 1):
+                fields = re.split(r'[\t,]', line.strip(), 1)
+                word = fields[0].strip()
+                if not word:
+                    continue
+                word_language = fields[1].strip().lower() if len(fields) > 1 and fields[1].strip() else language
+                if word_language not in LANGUAGES:
+                    print(f'{path}:{number}: unsupported language: {word_language}', file=sys.stderr)
+                    continue
+                yield word, word_language
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def _csv_rows(word: str, language: str, results: Dict) -> Iterator[List]:
+    """One row per rhyme, same-language rhymes first"""
+    groups = [(language, results['same_language'])]
+    groups.extend(results['cross_language'].items())
+    for rhyme_language, rhymes in groups:
+        for kind in ('perfect', 'slant'):
+            for rank, rhyme in enumerate(rhymes[kind], 1):
+                translation = json.dumps(rhyme.translation, ensure_ascii=False) if rhyme.translation else ''
+                yield [word, language, rhyme_language, kind, rank, rhyme.word, rhyme.phonetic, rhyme.suffix,
+                       rhyme.syllables, rhyme.similarity, translation]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import csv
+
+    parser = argparse.ArgumentParser(description='Find rhymes for many words, writing JSON Lines or CSV to stdout')
+    parser.add_argument('files', nargs='*', default=['-'],
+                        help="files of words or word<TAB>language / word,language lines ('-' for stdin)")
+    parser.add_argument('--language', choices=LANGUAGES, default='english',
+                        help='language of words listed without one')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--limit', '--top-k', type=int, dest='limit', help='keep the best N rhymes of each type')
+    parser.add_argument('--perfect-threshold', type=float, default=0.9)
+    parser.add_argument('--slant-threshold', type=float, default=0.6)
+    parser.add_argument('--no-cross', dest='cross', action='store_false', help='skip cross-language rhymes')
+    parser.add_argument('--min-syllables', type=int)
+    parser.add_argument('--max-syllables', type=int)
+    parser.add_argument('--same-syllables', action='store_true',
+                        help='keep only rhymes with as many syllables as the word')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes (0 for one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='words per worker task')
+    add_engine_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error('--workers must not be negative')
+    workers = args.workers or os.cpu_count() or 1
+
+    engine = engine_from_arguments(args)
+    if workers > 1:
+        # Workers map one shared snapshot instead of re-indexing each copy
+        engine.share()
+
+    results = engine.iter_batch_rhymes(_read_words(args.files, args.language), workers=workers,
+                                       chunk_size=args.chunk_size, limit=args.limit, columnar=True,
+                                       perfect_threshold=args.perfect_threshold,
+                                       slant_threshold=args.slant_threshold, cross=args.cross,
+                                       min_syllables=args.min_syllables, max_syllables=args.max_syllables,
+                                       same_syllables=args.same_syllables)
+    out = sys.stdout
+    try:
+        if args.format == 'csv':
+            writer = csv.writer(out, lineterminator='\n')
+            writer.writerow(_CSV_FIELDS)
+            for (word, language), word_results in results:
+                writer.writerows(_csv_rows(word, language, word_results))
+        else:
+            encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_rhyme_result_fields)
+            for (word, language), word_results in results:
+                out.write(encoder.encode({'word': word, 'language': language, 'results': word_results}))
+                out.write('\n')
+        out.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        return 1
+    finally:
+        results.close()
+        engine.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
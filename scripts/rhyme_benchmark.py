@@ -0,0 +1,256 @@
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    from .rhyme_algorithm import LANGUAGES, MultilingualRhymeEngine
+except ImportError:
+    from rhyme_algorithm import LANGUAGES, MultilingualRhymeEngine
+
+# Metrics where a larger value is a regression; throughput is the opposite
+_LOWER_IS_BETTER = ('p50_ms', 'p99_ms', 'mean_ms', 'peak_kb', 'seconds')
+_HIGHER_IS_BETTER = ('throughput_per_s',)
+
+
+def generate_lexicon(engine: MultilingualRhymeEngine, language: str, size: int, seed: int = 0) -> List[str]:
+    """Generate size unique pseudo-words from a language's phonetic mapping table
+
+    Words alternate consonant and vowel spellings taken from the mapping
+    keys, and some end in one of the table's longer endings, so the
+    phonetic rules are exercised the way real words exercise them.
+    """
+    rng = random.Random(f'{language}:{size}:{seed}')
+    patterns = list(engine.phonetic_mappings[language])
+    vowels = [p for p in patterns if p[0] in 'aeiouyáéíóúàâèêëîïôòùûüœ' and len(p) <= 2]
+    consonants = [p for p in patterns if p not in vowels and len(p) <= 2]
+    consonants += list('bcdfglmnprstv')
+    endings = [p for p in patterns if len(p) >= 3]
+
+    words = set()
+    attempts = 0
+    while len(words) < size and attempts < size * 20:
+        attempts += 1
+        parts = []
+        for _ in range(rng.randint(1, 4)):
+            if rng.random() < 0.8:
+                parts.append(rng.choice(consonants))
+            parts.append(rng.choice(vowels))
+        if rng.random() < 0.6:
+            parts.append(rng.choice(consonants))
+        elif endings and rng.random() < 0.5:
+            parts.append(rng.choice(endings))
+        words.add(''.join(parts))
+    return sorted(words)
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def measure(call: Callable, arguments: Sequence[tuple], items_per_call: int = 1,
+            memory_calls: int = 20) -> Dict:
+    """Time call over every argument tuple, then trace peak memory over a few"""
+    latencies = []
+    started = time.perf_counter()
+    for args in arguments:
+        call_started = time.perf_counter()
+        call(*args)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    # Tracing slows every allocation, so memory is measured in its own pass
+    tracemalloc.start()
+    try:
+        for args in arguments[:memory_calls]:
+            call(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'calls': len(latencies),
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'mean_ms': elapsed / len(latencies) * 1000,
+        'throughput_per_s': len(latencies) * items_per_call / elapsed if elapsed else None,
+        'peak_kb': peak / 1024
+    }
+
+
+def _load_lexicons(engine: MultilingualRhymeEngine, lexicons: Dict[str, List[str]]) -> Dict:
+    """Install lexicons and build every index, reporting time and peak memory"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        engine.word_dictionaries.update(lexicons)
+        engine.warm_up(lexicons)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'calls': 1, 'seconds': elapsed, 'peak_kb': peak / 1024}
+
+
+def run_benchmarks(sizes: Sequence[int], languages: Sequence[str] = LANGUAGES, queries: int = 200,
+                   batch_size: int = 10, seed: int = 0) -> Dict:
+    """Benchmark the engine on synthetic lexicons of each size"""
+    results = []
+    for size in sizes:
+        engine = MultilingualRhymeEngine()
+        lexicons = {language: generate_lexicon(engine, language, size, seed) for language in languages}
+        build = _load_lexicons(engine, lexicons)
+        results.append(dict(build, benchmark='index_build', language='all', size=size))
+
+        for language in languages:
+            rng = random.Random(f'queries:{language}:{size}:{seed}')
+            words = rng.sample(lexicons[language], min(queries, len(lexicons[language])))
+            suffixes = [engine.get_rhyming_suffix(phonetic) for phonetic in engine.phonetize_many(words, language)]
+            pairs = list(zip(suffixes, suffixes[1:] + suffixes[:1]))
+            batches = [words[i:i + batch_size] for i in range(0, len(words), batch_size)]
+            batch_arguments = [(batch, language) for batch in batches[:max(1, queries // (batch_size * 4))]]
+
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                export_source = engine.batch_find_rhymes(batches[0], language)
+            export_path = os.path.join(tempfile.mkdtemp(), 'rhymes.json')
+
+            def run_batch(batch, language):
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    engine.batch_find_rhymes(batch, language)
+
+            def run_iter_batch(batch, language):
+                for _ in engine.iter_batch_rhymes(batch, language, workers=1):
+                    pass
+
+            def run_export(results):
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    engine.export_results(results, export_path)
+
+            benchmarks = [
+                ('get_phonetic_representation', engine.get_phonetic_representation,
+                 [(word, language) for word in words], 1),
+                ('count_syllables', engine.count_syllables, [(word, language) for word in words], 1),
+                ('calculate_similarity', engine.calculate_similarity, pairs, 1),
+                ('find_rhymes', engine.find_rhymes, [(word, language) for word in words], 1),
+                ('find_cross_language_rhymes', engine.find_cross_language_rhymes,
+                 [(word, language) for word in words[:max(1, queries // 4)]], 1),
+                ('batch_find_rhymes', run_batch, batch_arguments, batch_size),
+                ('iter_batch_rhymes', run_iter_batch, batch_arguments, batch_size),
+                ('export_results', run_export, [(export_source,)] * 10, len(batches[0]))
+            ]
+            for name, call, arguments, items in benchmarks:
+                stats = measure(call, arguments, items)
+                results.append(dict(stats, benchmark=name, language=language, size=size))
+
+            os.remove(export_path)
+            os.rmdir(os.path.dirname(export_path))
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'sizes': list(sizes),
+            'languages': list(languages),
+            'queries': queries,
+            'seed': seed
+        },
+        'results': results
+    }
+
+
+def check_thresholds(report: Dict, thresholds: Dict) -> List[str]:
+    """Compare results with absolute limits
+
+    thresholds maps a benchmark name, optionally scoped as 'name@size', to
+    metric limits, e.g. {"find_rhymes@10000": {"p99_ms": 5}}. Throughput is
+    a minimum, every other metric a maximum.
+    """
+    failures = []
+    for result in report['results']:
+        for key in (result['benchmark'], f"{result['benchmark']}@{result['size']}"):
+            for metric, limit in thresholds.get(key, {}).items():
+                value = result.get(metric)
+                if value is None:
+                    continue
+                if metric in _HIGHER_IS_BETTER:
+                    failed, relation = value < limit, 'below minimum'
+                else:
+                    failed, relation = value > limit, 'above limit'
+                if failed:
+                    failures.append(f"{result['benchmark']} ({result['language']}, {result['size']}): "
+                                    f"{metric} {value:.3f} {relation} {limit}")
+    return failures
+
+
+def compare_baseline(report: Dict, baseline: Dict, max_regression: float = 0.2,
+                     metrics: Sequence[str] = ('p50_ms', 'throughput_per_s')) -> List[str]:
+    """Compare results with a previous report, allowing max_regression relative change"""
+    previous = {(r['benchmark'], r['language'], r['size']): r for r in baseline['results']}
+    failures = []
+    for result in report['results']:
+        old = previous.get((result['benchmark'], result['language'], result['size']))
+        if old is None:
+            continue
+        for metric in metrics:
+            new_value, old_value = result.get(metric), old.get(metric)
+            if not new_value or not old_value:
+                continue
+            if metric in _HIGHER_IS_BETTER:
+                change = (old_value - new_value) / old_value
+            else:
+                change = (new_value - old_value) / old_value
+            if change > max_regression:
+                failures.append(f"{result['benchmark']} ({result['language']}, {result['size']}): "
+                                f"{metric} regressed {change:.0%} ({old_value:.3f} -> {new_value:.3f})")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the rhyme engine on synthetic lexicons')
+    parser.add_argument('--sizes', default='1000,10000', help='comma-separated lexicon sizes (1k to 1M)')
+    parser.add_argument('--languages', default=','.join(LANGUAGES))
+    parser.add_argument('--queries', type=int, default=200, help='sampled query words per language')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--thresholds', help='JSON file of absolute metric limits')
+    parser.add_argument('--baseline', help='previous JSON report to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='allowed relative slowdown against the baseline')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks([int(size) for size in args.sizes.split(',')], args.languages.split(','),
+                            args.queries, seed=args.seed)
+
+    failures = []
+    if args.thresholds:
+        with open(args.thresholds, encoding='utf-8') as f:
+            failures += check_thresholds(report, json.load(f))
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures += compare_baseline(report, json.load(f), args.max_regression)
+    report['failures'] = failures
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    for failure in failures:
+        print(f'REGRESSION: {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
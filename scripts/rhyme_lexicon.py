@@ -0,0 +1,360 @@
+import json
+import mmap
+import re
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Compact lexicon file layout (little-endian):
+#   header   magic, version, count, rules fingerprint, language
+#   sections word offsets/blob, phonetic offsets/blob, suffix offsets/blob,
+#            syllable counts (u8), dictionary positions sorted by
+#            reversed suffix (u32) and, right after them, dictionary
+#            positions sorted by word (u32; version 2 and later)
+# Offset arrays hold count + 1 entries into their UTF-8 blob, and every
+# section starts on a 4-byte boundary so it can be viewed in place.
+# Section offsets are relative to the header, so the same image can be
+# embedded in an engine snapshot.
+LEXICON_MAGIC = b'RHLX'
+LEXICON_VERSION = 2
+_HEADER = struct.Struct('<4sHHI20s16s8I')
+
+# Engine snapshot layout (little-endian):
+#   header   magic, version, metadata offset and length
+#   body     one lexicon image per language, located through the metadata
+#   metadata JSON: engine tables and section offsets, written last
+SNAPSHOT_MAGIC = b'RHSN'
+SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct('<4sHHQQ')
+
+# data/comprehensive-dictionaries.ts export names
+_TS_EXPORT_NAMES = {
+    'englishWords': 'english',
+    'spanishWords': 'spanish',
+    'frenchWords': 'french'
+}
+_TS_TRANSLATION_EXPORTS = ('enhancedTranslations', 'translations')
+
+
+def _unique_words(words: Iterable[str]) -> List[str]:
+    seen = set()
+    unique = []
+    for word in words:
+        word = word.strip()
+        if word and word not in seen:
+            seen.add(word)
+            unique.append(word)
+    return unique
+
+
+def read_word_list(path: str) -> List[str]:
+    """Read a plain text word list (one word per line, '#' comments)"""
+    with open(path, encoding='utf-8') as f:
+        return _unique_words(line for line in f if not line.startswith('#'))
+
+
+def read_cmudict(path: str) -> List[str]:
+    """Read the headwords of a CMUdict-style pronunciation file
+
+    The ARPAbet column is not used: rhymes are compared in the engine's own
+    phonetic alphabet, so every word is phonetized with the language rules.
+    Alternate pronunciations such as 'READ(2)' collapse onto their headword.
+    """
+    def headwords(f):
+        for line in f:
+            if not line.strip() or line.startswith(';;;'):
+                continue
+            word = line.split(None, 1)[0]
+            yield re.sub(r'\(\d+\)$', '', word).lower()
+
+    with open(path, encoding='latin-1') as f:
+        return _unique_words(headwords(f))
+
+
+def read_json_dictionaries(path: str) -> Dict[str, List[str]]:
+    """Read a JSON export of data/comprehensive-dictionaries.ts
+
+    Accepts either the TypeScript export names ('englishWords', ...) or
+    language names as keys.
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    dictionaries = {}
+    for key, words in data.items():
+        language = _TS_EXPORT_NAMES.get(key, key)
+        dictionaries[language] = _unique_words(words)
+    return dictionaries
+
+
+def read_json_translations(path: str) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """Read a JSON export of data/enhanced-translations.ts
+
+    Accepts the from -> to -> word tables either at the top level or under
+    the TypeScript export name.
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    for name in _TS_TRANSLATION_EXPORTS:
+        if isinstance(data.get(name), dict):
+            data = data[name]
+            break
+    return {from_language: {to_language: {word.strip().lower(): translation.strip()
+                                          for word, translation in table.items()}
+                            for to_language, table in targets.items()}
+            for from_language, targets in data.items()}
+
+
+def _align(f, boundary: int = 4) -> int:
+    padding = -f.tell() % boundary
+    if padding:
+        f.write(b'\0' * padding)
+    return f.tell()
+
+
+def _u32_bytes(values: Iterable[int]) -> bytes:
+    values = array('I', values)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def _write_strings(f, strings: Sequence, base: int) -> List[int]:
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    offsets_at = _align(f) - base
+    f.write(_u32_bytes(offsets))
+    blob_at = f.tell() - base
+    f.write(b''.join(encoded))
+    return [offsets_at, blob_at]
+
+
+def suffix_order(suffixes: Sequence[str]) -> List[int]:
+    """Dictionary positions sorted by reversed suffix"""
+    return sorted(range(len(suffixes)), key=lambda i: suffixes[i][::-1])
+
+
+def _write_image(f, language: str, fingerprint: bytes, words: Sequence, phonetics: Sequence,
+                 suffixes: Sequence, syllables: Sequence, order: Sequence[int]) -> List[int]:
+    """Write one lexicon image at the next 8-byte boundary, returning [offset, length]"""
+    base = _align(f, 8)
+    f.write(b'\0' * _HEADER.size)
+    sections = []
+    sections += _write_strings(f, words, base)
+    sections += _write_strings(f, phonetics, base)
+    sections += _write_strings(f, suffixes, base)
+    sections.append(_align(f) - base)
+    f.write(bytes(min(count, 255) for count in syllables))
+    sections.append(_align(f) - base)
+    f.write(_u32_bytes(order))
+    f.write(_u32_bytes(sorted(range(len(words)), key=words.__getitem__)))
+    end = f.tell()
+
+    f.seek(base)
+    f.write(_HEADER.pack(LEXICON_MAGIC, LEXICON_VERSION, 0, len(words), fingerprint,
+                         language.encode('ascii'), *sections))
+    f.seek(end)
+    return [base, end - base]
+
+
+def write_lexicon(path: str, language: str, fingerprint: bytes, words: Sequence,
+                  phonetics: Sequence, suffixes: Sequence, syllables: Sequence):
+    """Write precomputed lexicon columns to the compact binary format"""
+    with open(path, 'wb') as f:
+        _write_image(f, language, fingerprint, words, phonetics, suffixes, syllables, suffix_order(suffixes))
+
+
+def _u32_view(view: memoryview, start: int, count: int):
+    data = view[start:start + 4 * count]
+    if sys.byteorder == 'little':
+        return data.cast('I')
+    values = array('I', data)
+    values.byteswap()
+    return values
+
+
+class _StringColumn(Sequence):
+    """Read-only view of one string section of a mapped lexicon"""
+
+    def __init__(self, view: memoryview, offsets, blob_start: int, count: int):
+        self._view = view
+        self._offsets = offsets
+        self._blob_start = blob_start
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('lexicon index out of range')
+        start = self._blob_start + self._offsets[i]
+        end = self._blob_start + self._offsets[i + 1]
+        return str(self._view[start:end], 'utf-8')
+
+
+class MappedLexicon:
+    """Lexicon file mapped read-only into memory
+
+    Columns decode entries on access, so opening a file costs the same
+    whatever its size and pages are only read as queries touch them.
+    view reads an image embedded in an already mapped file instead.
+    """
+
+    def __init__(self, path: str, view: Optional[memoryview] = None):
+        self.path = path
+        self._mmap = None
+        if view is None:
+            with open(path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(self._mmap)
+        self._view = view
+
+        if len(self._view) < _HEADER.size:
+            raise ValueError(f'{path} is not a rhyme lexicon')
+        (magic, version, _, count, fingerprint, language,
+         *sections) = _HEADER.unpack_from(self._view)
+        if magic != LEXICON_MAGIC:
+            raise ValueError(f'{path} is not a rhyme lexicon')
+        if not 1 <= version <= LEXICON_VERSION:
+            raise ValueError(f'{path} has unsupported lexicon version {version}')
+
+        self.count = count
+        self.fingerprint = fingerprint
+        self.language = language.rstrip(b'\0').decode('ascii')
+
+        (word_offsets, word_blob, phonetic_offsets, phonetic_blob,
+         suffix_offsets, suffix_blob, syllables, order) = sections
+        self.words = _StringColumn(self._view, _u32_view(self._view, word_offsets, count + 1), word_blob, count)
+        self.phonetics = _StringColumn(self._view, _u32_view(self._view, phonetic_offsets, count + 1), phonetic_blob, count)
+        self.suffixes = _StringColumn(self._view, _u32_view(self._view, suffix_offsets, count + 1), suffix_blob, count)
+        self.syllables = self._view[syllables:syllables + count]
+        self.order = _u32_view(self._view, order, count)
+        # Version 1 images have no word order; lookups then fall back to a map
+        self.word_order = _u32_view(self._view, order + 4 * count, count) if version >= 2 else None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words)
+
+    def close(self):
+        """Release the mapping (columns are unusable afterwards)"""
+        for column in (self.words, self.phonetics, self.suffixes):
+            if isinstance(column._offsets, memoryview):
+                column._offsets.release()
+        for positions in (self.order, self.word_order):
+            if isinstance(positions, memoryview):
+                positions.release()
+        self.syllables.release()
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+
+def write_snapshot(path: str, tables: Dict, lexicons: Dict[str, tuple]):
+    """Write an engine snapshot
+
+    lexicons maps each language to (fingerprint, words, phonetics, suffixes,
+    syllables).
+    """
+    metadata = {'tables': tables, 'languages': {}}
+    with open(path, 'wb') as f:
+        f.write(b'\0' * _SNAPSHOT_HEADER.size)
+
+        for language, (fingerprint, words, phonetics, suffixes, syllables) in lexicons.items():
+            order = suffix_order(suffixes)
+            metadata['languages'][language] = _write_image(f, language, fingerprint, words, phonetics, suffixes,
+                                                           syllables, order)
+
+        data = json.dumps(metadata, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        metadata_at = f.tell()
+        f.write(data)
+        f.seek(0)
+        f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, metadata_at, len(data)))
+
+
+class MappedSnapshot:
+    """Engine snapshot mapped read-only into memory
+
+    Opening reads only the header and metadata; lexicon images are viewed
+    in place when asked for.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        if len(self._view) < _SNAPSHOT_HEADER.size:
+            raise ValueError(f'{path} is not a rhyme engine snapshot')
+        magic, version, _, metadata_at, metadata_length = _SNAPSHOT_HEADER.unpack_from(self._view)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f'{path} is not a rhyme engine snapshot')
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f'{path} has unsupported snapshot version {version}')
+
+        metadata = json.loads(str(self._view[metadata_at:metadata_at + metadata_length], 'utf-8'))
+        self.tables = metadata['tables']
+        self._sections = metadata['languages']
+        self.languages = list(self._sections)
+        self._opened: List[MappedLexicon] = []
+
+    def lexicon(self, language: str) -> MappedLexicon:
+        """Open the lexicon image saved for a language"""
+        start, length = self._sections[language]
+        lexicon = MappedLexicon(self.path, self._view[start:start + length])
+        self._opened.append(lexicon)
+        return lexicon
+
+    def close(self):
+        """Release the mapping (lexicons opened from it are unusable afterwards)"""
+        for lexicon in self._opened:
+            lexicon.close()
+        self._opened.clear()
+        self._view.release()
+        self._mmap.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    try:
+        from .rhyme_algorithm import MultilingualRhymeEngine
+    except ImportError:
+        from rhyme_algorithm import MultilingualRhymeEngine
+
+    parser = argparse.ArgumentParser(description='Build compact rhyme lexicon files')
+    parser.add_argument('source', help='word list, CMUdict file or JSON dictionary export')
+    parser.add_argument('output', help='output file, or output directory for JSON exports')
+    parser.add_argument('--format', choices=['text', 'cmudict', 'json'], default='text')
+    parser.add_argument('--language', default='english', help='language of a text or CMUdict source')
+    args = parser.parse_args(argv)
+
+    engine = MultilingualRhymeEngine()
+    if args.format == 'json':
+        import os
+        os.makedirs(args.output, exist_ok=True)
+        for language, words in read_json_dictionaries(args.source).items():
+            path = os.path.join(args.output, f'{language}.rlx')
+            engine.build_lexicon(words, language, path)
+            print(f'{language}: {len(words)} words -> {path}')
+    else:
+        reader = read_cmudict if args.format == 'cmudict' else read_word_list
+        words = reader(args.source)
+        engine.build_lexicon(words, args.language, args.output)
+        print(f'{args.language}: {len(words)} words -> {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+import json
+import re
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+try:
+    from .rhyme_algorithm import LANGUAGES, MultilingualRhymeEngine
+except ImportError:
+    from rhyme_algorithm import LANGUAGES, MultilingualRhymeEngine
+
+# The last word of a line, allowing inner apostrophes and hyphens
+# ("don't", "aujourd'hui", "well-known") and any trailing punctuation
+_LAST_WORD = re.compile(r"([^\W\d_]+(?:['’\-][^\W\d_]+)*)[\W\d_]*$")
+
+
+def line_final_word(line: str) -> Optional[str]:
+    """The last word of a line of verse, or None when it has none"""
+    match = _LAST_WORD.search(line)
+    return match.group(1) if match else None
+
+
+def scheme_letter(rhyme_class: int) -> str:
+    """A, B, ... Z, AA, AB, ... for rhyme classes in order of first appearance"""
+    letters = ''
+    rhyme_class += 1
+    while rhyme_class:
+        rhyme_class, remainder = divmod(rhyme_class - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _stanzas(lines: Iterable[str], max_lines: int) -> Iterator[Tuple[int, List[str]]]:
+    """(first line number, lines) of each blank-line separated stanza, split after max_lines"""
+    stanza: List[str] = []
+    start = 1
+    number = 0
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if line.strip():
+            if not stanza:
+                start = number
+            stanza.append(line)
+            if len(stanza) < max_lines:
+                continue
+        if stanza:
+            yield start, stanza
+            stanza = []
+    if stanza:
+        yield start, stanza
+
+
+def analyze_lines(engine: MultilingualRhymeEngine, lines: Iterable[str], language: str = 'english',
+                  batch_lines: int = 2048, max_stanza_lines: int = 64, suffix_length: int = 2,
+                  source: Optional[str] = None) -> Iterator[Dict]:
+    """Label the rhyme scheme of every stanza read from lines, one record per stanza
+
+    Lines are read lazily and their final words phonetized a batch of
+    stanzas at a time, so memory stays bounded by batch_lines whatever the
+    input size. Lines whose final words share a rhyming suffix form one
+    rhyme class; lines with no word are marked '-'. Schemes with more than
+    26 classes separate their letters with spaces.
+    """
+    if language not in LANGUAGES:
+        raise ValueError(f'Unsupported language: {language}')
+
+    stanzas = _stanzas(lines, max_stanza_lines)
+    stanza_number = 0
+    while True:
+        batch = []
+        batch_size = 0
+        for stanza in stanzas:
+            batch.append(stanza)
+            batch_size += len(stanza[1])
+            if batch_size >= batch_lines:
+                break
+        if not batch:
+            return
+
+        words = [[line_final_word(line) for line in stanza_lines] for _, stanza_lines in batch]
+        phonetics = iter(engine.phonetize_many([word for stanza_words in words for word in stanza_words if word],
+                                               language))
+        for (start, stanza_lines), stanza_words in zip(batch, words):
+            stanza_number += 1
+            classes: Dict[str, int] = {}
+            scheme = []
+            suffixes = []
+            for word in stanza_words:
+                if word is None:
+                    scheme.append('-')
+                    suffixes.append(None)
+                    continue
+                suffix = engine.get_rhyming_suffix(next(phonetics), suffix_length)
+                scheme.append(scheme_letter(classes.setdefault(suffix, len(classes))))
+                suffixes.append(suffix)
+
+            record = {
+                'stanza': stanza_number,
+                'line': start,
+                'lines': len(stanza_lines),
+                'scheme': ''.join(scheme) if all(len(letter) == 1 for letter in scheme) else ' '.join(scheme),
+                'words': stanza_words,
+                'suffixes': suffixes
+            }
+            if source is not None:
+                record['source'] = source
+            yield record
+
+
+def analyze_files(engine: MultilingualRhymeEngine, paths: Iterable[str], language: str = 'english',
+                  **options) -> Iterator[Dict]:
+    """analyze_lines over each file in turn ('-' reads stdin)"""
+    for path in paths:
+        if path == '-':
+            yield from analyze_lines(engine, sys.stdin, language, source='-', **options)
+            continue
+        with open(path, encoding='utf-8', errors='replace') as f:
+            yield from analyze_lines(engine, f, language, source=path, **options)
+
+
+def write_jsonl(records: Iterable[Dict], out: TextIO) -> int:
+    """Write records as JSON Lines, returning how many were written"""
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    count = 0
+    for record in records:
+        out.write(encoder.encode(record))
+        out.write('\n')
+        count += 1
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Label the rhyme scheme of each stanza as JSON Lines')
+    parser.add_argument('files', nargs='*', default=['-'], help="text files, one verse line per line ('-' for stdin)")
+    parser.add_argument('--language', choices=LANGUAGES, default='english')
+    parser.add_argument('--output', help='write JSON Lines here instead of stdout')
+    parser.add_argument('--batch-lines', type=int, default=2048, help='lines phonetized per batch')
+    parser.add_argument('--max-stanza-lines', type=int, default=64, help='split longer stanzas')
+    parser.add_argument('--suffix-length', type=int, default=2, help='phonetic characters that must match to rhyme')
+    parser.add_argument('--snapshot', help='use the phonetic rules from an engine snapshot')
+    args = parser.parse_args(argv)
+
+    engine = MultilingualRhymeEngine.load_snapshot(args.snapshot) if args.snapshot else MultilingualRhymeEngine()
+    records = analyze_files(engine, args.files, args.language, batch_lines=args.batch_lines,
+                            max_stanza_lines=args.max_stanza_lines, suffix_length=args.suffix_length)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            write_jsonl(records, out)
+    else:
+        write_jsonl(records, sys.stdout)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,359 @@
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+try:
+    from .rhyme_algorithm import (LANGUAGES, MultilingualRhymeEngine, _rhyme_result_fields, add_engine_arguments,
+                                  engine_from_arguments)
+except ImportError:
+    from rhyme_algorithm import (LANGUAGES, MultilingualRhymeEngine, _rhyme_result_fields, add_engine_arguments,
+                                 engine_from_arguments)
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RhymeService:
+    """Serves rhyme queries from one warm engine
+
+    Identical queries in flight share one computation. Distinct queries that
+    arrive within batch_window seconds are run together as a single job on
+    the executor, so the event loop never does engine work itself.
+    """
+
+    def __init__(self, engine: Optional[MultilingualRhymeEngine] = None, workers: int = 2,
+                 batch_window: float = 0.002, max_batch_size: int = 64, latency_samples: int = 4096):
+        self.engine = engine or MultilingualRhymeEngine()
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rhyme')
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+        self._queue: List[Tuple[Tuple, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._latencies = deque(maxlen=latency_samples)
+        self._running_batches = 0
+        self.stats_counters = {
+            'requests': 0,
+            'queries': 0,
+            'coalesced': 0,
+            'batches': 0,
+            'batched_queries': 0,
+            'errors': 0,
+            'max_queue_depth': 0
+        }
+
+    def warm_up(self):
+        self.engine.warm_up()
+
+    async def query(self, word: str, language: str = 'english', limit: Optional[int] = None,
+                    cross: bool = True) -> bytes:
+        """JSON-encoded rhymes for a word, shared with identical queries in flight
+
+        Words are matched case-insensitively, as in the engine's cache, and
+        answered in lower case.
+        """
+        key = (word.lower(), language, limit, cross)
+        self.stats_counters['queries'] += 1
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats_counters['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        self._queue.append((key, future))
+        self.stats_counters['max_queue_depth'] = max(self.stats_counters['max_queue_depth'], len(self._queue))
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._queue = self._queue, []
+        if not batch:
+            return
+
+        self.stats_counters['batches'] += 1
+        self.stats_counters['batched_queries'] += len(batch)
+        self._running_batches += 1
+        keys = [key for key, _ in batch]
+        job = asyncio.get_running_loop().run_in_executor(self._executor, self._run_batch, keys)
+        job.add_done_callback(lambda done: self._finish_batch(batch, done))
+
+    def _finish_batch(self, batch, job: asyncio.Future):
+        self._running_batches -= 1
+        if job.cancelled() or job.exception() is not None:
+            error = RuntimeError('Rhyme batch did not complete') if job.cancelled() else job.exception()
+            outcomes = [error] * len(batch)
+        else:
+            outcomes = job.result()
+
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, Exception):
+                self.stats_counters['errors'] += 1
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def _run_batch(self, keys: List[Tuple]) -> List:
+        outcomes = []
+        for word, language, limit, cross in keys:
+            try:
+                if cross:
+                    results = self.engine.collect_all_rhymes(word, language, limit)
+                else:
+                    results = self.engine.find_rhymes(word, language, limit=limit)
+                outcomes.append(json.dumps(results, ensure_ascii=False, separators=(',', ':'),
+                                           default=_rhyme_result_fields).encode('utf-8'))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    def record_latency(self, seconds: float):
+        self._latencies.append(seconds)
+
+    def stats(self) -> Dict:
+        """Request, batching, queue-depth and latency statistics"""
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        stats = dict(self.stats_counters)
+        stats.update({
+            'queue_depth': len(self._queue),
+            'in_flight': len(self._in_flight),
+            'running_batches': self._running_batches,
+            'latency_ms': {
+                'samples': len(latencies),
+                'p50': percentile(0.50),
+                'p99': percentile(0.99),
+                'max': latencies[-1] * 1000 if latencies else None
+            },
+            'cache': self.engine.cache_stats(),
+            'metrics': self.engine.metrics_snapshot()
+        })
+        return stats
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_query(params: Dict) -> Tuple[str, str, Optional[int], bool]:
+    word = params.get('word')
+    if not isinstance(word, str) or not word.strip():
+        raise ValueError('Missing word')
+    language = params.get('language', 'english')
+    if language not in LANGUAGES:
+        raise ValueError(f'Unsupported language: {language}')
+    limit = params.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError(f'limit must be an integer, not {limit!r}') from None
+        if limit < 0:
+            raise ValueError('limit must not be negative')
+    cross = params.get('cross', True)
+    if isinstance(cross, str):
+        cross = cross.lower() not in ('0', 'false', 'no')
+    return word.strip(), language, limit, bool(cross)
+
+
+class RhymeServer:
+    """Minimal HTTP/1.1 JSON front end for RhymeService
+
+    GET  /rhymes?word=love&language=english&limit=10&cross=1
+    POST /rhymes  {"word": "love", "language": "english", "limit": 10, "cross": true}
+    GET  /stats
+    GET  /health
+    """
+
+    max_body = 64 * 1024
+
+    def __init__(self, service: RhymeService, host: str = '127.0.0.1', port: int = 8765):
+        self.service = service
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self.service.warm_up()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Report the real port when started on port 0
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.service.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Without a usable length the body cannot be framed; give up on the connection
+                    await self._respond(writer, 400, {'error': 'Invalid Content-Length'}, False)
+                    break
+                if length > self.max_body:
+                    await self._respond(writer, 413, {'error': 'Request body too large'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self._dispatch(request_line, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request_line: bytes, body: bytes):
+        started = time.perf_counter()
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            return 400, {'error': 'Malformed request line'}
+
+        url = urlsplit(target)
+        if url.path == '/health':
+            return 200, {'status': 'ok'}
+        if url.path == '/stats':
+            return 200, self.service.stats()
+        if url.path != '/rhymes':
+            return 404, {'error': 'Not found'}
+
+        self.service.stats_counters['requests'] += 1
+        try:
+            if method == 'GET':
+                params = dict(parse_qsl(url.query))
+            elif method == 'POST':
+                params = json.loads(body or b'{}')
+                if not isinstance(params, dict):
+                    raise ValueError('Request body must be a JSON object')
+            else:
+                return 405, {'error': f'Method {method} not allowed'}
+            query = _parse_query(params)
+        except (TypeError, ValueError) as e:
+            return 400, {'error': str(e)}
+
+        try:
+            payload = await self.service.query(*query)
+        except Exception as e:
+            return 500, {'error': str(e)}
+        self.service.record_latency(time.perf_counter() - started)
+        return 200, payload
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f'HTTP/1.1 {status} {_REASONS.get(status, "")}\r\n'
+                f'Content-Type: application/json; charset=utf-8\r\n'
+                f'Content-Length: {len(payload)}\r\n'
+                f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+        writer.write(head.encode('latin-1') + payload)
+        await writer.drain()
+
+
+async def fetch_json(host: str, port: int, path: str, payload: Optional[Dict] = None) -> Tuple[int, Dict]:
+    """Tiny local client: one request per connection, returns (status, JSON body)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        method = 'POST' if payload is not None else 'GET'
+        writer.write(f'{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n'
+                     f'Content-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body)
+        await writer.drain()
+
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await reader.readexactly(length))
+    finally:
+        writer.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve the rhyme engine over HTTP/JSON')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2, help='executor threads for engine work')
+    parser.add_argument('--batch-window-ms', type=float, default=2.0)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--cache-entries', type=int, default=0, help='enable the query cache with this many entries')
+    parser.add_argument('--metrics', action='store_true', help='report per-stage engine metrics under /stats')
+    add_engine_arguments(parser)
+    args = parser.parse_args(argv)
+
+    engine = engine_from_arguments(args)
+    if args.cache_entries:
+        engine.enable_cache(args.cache_entries)
+    if args.metrics:
+        engine.enable_metrics()
+    service = RhymeService(engine, workers=args.workers, batch_window=args.batch_window_ms / 1000,
+                           max_batch_size=args.max_batch_size)
+    server = RhymeServer(service, args.host, args.port)
+
+    async def run():
+        await server.start()
+        print(f'Serving rhymes on http://{server.host}:{server.port}')
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,739 @@
+"""Equivalence checks: the indexed engine against a brute-force linear scan
+
+Run with `python -m unittest scripts/test_rhyme_algorithm.py` (or pytest).
+The reference functions below are the original cascade of re.sub rules
+and the original linear scan over the dictionary; every fast path of the
+engine must return exactly what they do.
+"""
+import io
+import json
+import random
+import re
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .rhyme_algorithm import (LANGUAGES, MultilingualRhymeEngine, PhoneticTransducer, QueryCache, TranslationGraph,
+                                  _load_numpy, _rhyme_result_fields, main, read_results_jsonl)
+except ImportError:
+    from rhyme_algorithm import (LANGUAGES, MultilingualRhymeEngine, PhoneticTransducer, QueryCache, TranslationGraph,
+                                 _load_numpy, _rhyme_result_fields, main, read_results_jsonl)
+
+EXTRA_WORDS = ['rhythm', 'queue', 'strength', 'aéroport', 'Hablée', 'xyz', 'cœur', 'ñandú', 'tion', 'e']
+
+
+def reference_phonetic(engine: MultilingualRhymeEngine, word: str, language: str) -> str:
+    phonetic = word.lower()
+    for pattern, sound in sorted(engine.phonetic_mappings[language].items(), key=lambda x: len(x[0]), reverse=True):
+        if pattern and sound:
+            phonetic = re.sub(pattern, sound, phonetic)
+    return phonetic
+
+
+# The tests never change the phonetic rules, so the scans can share results
+_reference_phonetics: Dict[Tuple[str, str], str] = {}
+
+
+def _scan_phonetic(engine: MultilingualRhymeEngine, word: str, language: str) -> str:
+    phonetic = _reference_phonetics.get((language, word))
+    if phonetic is None:
+        phonetic = _reference_phonetics[language, word] = reference_phonetic(engine, word, language)
+    return phonetic
+
+
+def reference_syllables(word: str, language: str) -> int:
+    lower_word = word.lower()
+    if language == 'spanish':
+        vowels = re.findall(r'[aeiouáéíóúü]', lower_word)
+        if not vowels:
+            return 1
+        return max(1, len(vowels) - len(re.findall(r'[aeiou][aeiou]', lower_word)))
+    pattern = r'[aeiouyàâéèêëïîôöùûü]' if language == 'french' else r'[aeiouy]+'
+    vowels = re.findall(pattern, lower_word)
+    if not vowels:
+        return 1
+    count = len(vowels)
+    if lower_word.endswith('e') and count > 1:
+        count -= 1
+    return max(1, count)
+
+
+def reference_similarity(phonetic1: str, phonetic2: str) -> float:
+    if phonetic1 == phonetic2:
+        return 1.0
+    longer = max(len(phonetic1), len(phonetic2))
+    if longer == 0:
+        return 1.0
+    matches = 0
+    for i in range(1, min(len(phonetic1), len(phonetic2)) + 1):
+        if phonetic1[-i:] != phonetic2[-i:]:
+            break
+        matches = i
+    return matches / longer
+
+
+def reference_rhymes(engine: MultilingualRhymeEngine, word: str, language: str, perfect_threshold: float = 0.9,
+                     slant_threshold: float = 0.6, limit: Optional[int] = None,
+                     syllable_range: Optional[Tuple[int, int]] = None,
+                     same_syllables: bool = False) -> Tuple[List[tuple], List[tuple]]:
+    """(word, similarity, syllables) rows of a linear scan, stably sorted like the original"""
+    input_phonetic = _scan_phonetic(engine, word, language)
+    input_suffix = input_phonetic[-min(2, len(input_phonetic)):]
+    input_syllables = reference_syllables(word, language)
+    low, high = syllable_range or (0, 1 << 30)
+    if same_syllables:
+        low, high = max(low, input_syllables), min(high, input_syllables)
+
+    perfect, slant = [], []
+    for candidate in engine.word_dictionaries[language]:
+        if candidate.lower() == word.lower():
+            continue
+        phonetic = _scan_phonetic(engine, candidate, language)
+        syllables = reference_syllables(candidate, language)
+        similarity = reference_similarity(input_suffix, phonetic[-min(2, len(phonetic)):])
+        if not low <= syllables <= high:
+            continue
+        if similarity >= perfect_threshold:
+            perfect.append((candidate, similarity, syllables))
+        elif similarity >= slant_threshold:
+            slant.append((candidate, similarity, syllables))
+
+    def ranked(rows):
+        rows.sort(key=lambda row: (-row[1], abs(row[2] - input_syllables)))
+        return rows if limit is None else rows[:limit]
+
+    return ranked(perfect), ranked(slant)
+
+
+def reference_edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def reference_edit_rhymes(engine: MultilingualRhymeEngine, word: str, language: str, max_edits: int,
+                          slant_threshold: float = 0.0, perfect_threshold: float = 0.9,
+                          tail_length: int = 4) -> Tuple[List[tuple], List[tuple]]:
+    """Rows of a linear scan with edit-distance slant rhymes on the last tail_length phonetic characters"""
+    input_phonetic = _scan_phonetic(engine, word, language)
+    input_suffix = input_phonetic[-min(2, len(input_phonetic)):]
+    input_tail = input_phonetic[-tail_length:]
+    input_syllables = reference_syllables(word, language)
+
+    perfect, slant = [], []
+    for candidate in engine.word_dictionaries[language]:
+        if candidate.lower() == word.lower():
+            continue
+        phonetic = _scan_phonetic(engine, candidate, language)
+        syllables = reference_syllables(candidate, language)
+        similarity = reference_similarity(input_suffix, phonetic[-min(2, len(phonetic)):])
+        if similarity >= perfect_threshold:
+            perfect.append((candidate, similarity, syllables))
+            continue
+        tail = phonetic[-tail_length:]
+        distance = reference_edit_distance(input_tail, tail)
+        if distance <= max_edits:
+            longer = max(len(input_tail), len(tail))
+            similarity = 1 - distance / longer if longer else 1.0
+            if similarity >= slant_threshold:
+                slant.append((candidate, similarity, syllables))
+
+    for found in (perfect, slant):
+        found.sort(key=lambda row: (-row[1], abs(row[2] - input_syllables)))
+    return perfect, slant
+
+
+def rows(results: Dict) -> Tuple[List[tuple], List[tuple]]:
+    return tuple([(rhyme.word, rhyme.similarity, rhyme.syllables) for rhyme in results[kind]]
+                 for kind in ('perfect', 'slant'))
+
+
+class PhoneticsTest(unittest.TestCase):
+    def test_transducer_matches_ordered_rules(self):
+        engine = MultilingualRhymeEngine()
+        for language in LANGUAGES:
+            words = list(engine.word_dictionaries[language]) + EXTRA_WORDS
+            phonetics = engine.phonetize_many(words, language)
+            for word, phonetic in zip(words, phonetics):
+                expected = reference_phonetic(engine, word, language)
+                self.assertEqual(engine.get_phonetic_representation(word, language), expected, (word, language))
+                self.assertEqual(phonetic, expected, (word, language))
+
+    def test_transducer_table_is_capped(self):
+        engine = MultilingualRhymeEngine()
+        generator = random.Random(3)
+        for language in LANGUAGES:
+            rules = sorted(engine.phonetic_mappings[language].items(), key=lambda x: len(x[0]), reverse=True)
+            transducer = PhoneticTransducer(rules, max_states=16)
+            letters = ''.join(sorted({char for pattern, _ in rules for char in pattern})) + 'xyz'
+            for _ in range(300):
+                word = ''.join(generator.choice(letters) for _ in range(generator.randint(1, 12)))
+                self.assertEqual(transducer.transduce(word), reference_phonetic(engine, word, language), (word, language))
+                self.assertLessEqual(len(transducer), 16)
+
+    def test_syllable_counters_match_reference(self):
+        engine = MultilingualRhymeEngine()
+        for language in LANGUAGES:
+            for word in list(engine.word_dictionaries[language]) + EXTRA_WORDS:
+                self.assertEqual(engine.count_syllables(word, language), reference_syllables(word, language),
+                                 (word, language))
+
+
+class FindRhymesTest(unittest.TestCase):
+    def check_engine(self, engine: MultilingualRhymeEngine, **options):
+        for language in LANGUAGES:
+            for word in list(engine.word_dictionaries[language]) + EXTRA_WORDS:
+                for limit in (None, 3):
+                    with self.subTest(word=word, language=language, limit=limit, **options):
+                        expected = reference_rhymes(engine, word, language, limit=limit)
+                        self.assertEqual(rows(engine.find_rhymes(word, language, limit=limit, **options)), expected)
+                        # A second call may be served from the cache
+                        self.assertEqual(rows(engine.find_rhymes(word, language, limit=limit, **options)), expected)
+
+    def test_index(self):
+        self.check_engine(MultilingualRhymeEngine())
+
+    def test_columnar(self):
+        self.check_engine(MultilingualRhymeEngine(), columnar=True)
+
+    def test_numpy(self):
+        if _load_numpy() is None:
+            self.skipTest('NumPy is not installed')
+        self.check_engine(MultilingualRhymeEngine(), scoring='numpy')
+
+    def test_rhyme_families(self):
+        engine = MultilingualRhymeEngine()
+        engine.build_rhyme_families()
+        self.check_engine(engine)
+
+    def test_cache(self):
+        engine = MultilingualRhymeEngine()
+        engine.enable_cache(64)
+        self.check_engine(engine)
+
+    def test_thresholds(self):
+        engine = MultilingualRhymeEngine()
+        for perfect_threshold, slant_threshold in ((1.0, 0.5), (0.75, 0.25), (0.5, 0.0)):
+            for word in engine.word_dictionaries['english'][::5]:
+                with self.subTest(word=word, perfect=perfect_threshold, slant=slant_threshold):
+                    self.assertEqual(rows(engine.find_rhymes(word, 'english', perfect_threshold, slant_threshold)),
+                                     reference_rhymes(engine, word, 'english', perfect_threshold, slant_threshold))
+
+    def test_syllable_filters(self):
+        plain = MultilingualRhymeEngine()
+        families = MultilingualRhymeEngine()
+        families.build_rhyme_families()
+        filters = [({'min_syllables': 2}, (2, 1 << 30), False), ({'max_syllables': 1}, (0, 1), False),
+                   ({'min_syllables': 2, 'max_syllables': 3}, (2, 3), False), ({'same_syllables': True}, None, True)]
+        for engine in (plain, families):
+            for language in LANGUAGES:
+                for word in engine.word_dictionaries[language]:
+                    for options, syllable_range, same in filters:
+                        with self.subTest(word=word, language=language, **options):
+                            self.assertEqual(rows(engine.find_rhymes(word, language, limit=4, **options)),
+                                             reference_rhymes(engine, word, language, limit=4,
+                                                              syllable_range=syllable_range, same_syllables=same))
+
+    def test_incremental_updates(self):
+        engine = MultilingualRhymeEngine()
+        engine.find_rhymes('love', 'english')
+        generator = random.Random(7)
+        syllables = ['ba', 'ke', 'lo', 'mi', 'tu', 'ove', 'ight', 'at', 'ent', 'ing']
+        added = sorted({''.join(generator.choice(syllables) for _ in range(generator.randint(1, 3)))
+                        for _ in range(400)})
+        engine.add_words(added, 'english')
+        engine.remove_words(added[::3] + ['love', 'cat'], 'english')
+        for word in ['glove', 'hat', 'night', 'kelove', 'bat', 'miing']:
+            with self.subTest(word=word):
+                self.assertEqual(rows(engine.find_rhymes(word, 'english')),
+                                 reference_rhymes(engine, word, 'english'))
+
+
+class EditSlantTest(unittest.TestCase):
+    def check_engine(self, engine: MultilingualRhymeEngine, words: Dict[str, List[str]]):
+        for language, language_words in words.items():
+            for word in language_words:
+                for max_edits, slant_threshold in ((1, None), (2, None), (2, 0.5), (0, None)):
+                    with self.subTest(word=word, language=language, max_edits=max_edits, slant=slant_threshold):
+                        expected = reference_edit_rhymes(engine, word, language, max_edits, slant_threshold or 0.0)
+                        self.assertEqual(rows(engine.find_rhymes(word, language, slant='edit', max_edits=max_edits,
+                                                                 slant_threshold=slant_threshold)), expected)
+
+    def test_edit_slant(self):
+        engine = MultilingualRhymeEngine()
+        self.check_engine(engine, {language: list(engine.word_dictionaries[language]) + EXTRA_WORDS
+                                   for language in LANGUAGES})
+
+    def test_edit_slant_after_updates(self):
+        engine = MultilingualRhymeEngine()
+        # Build the SlantIndex first so the changes below go through its delta
+        engine.find_rhymes('cat', 'english', slant='edit', max_edits=2)
+        engine.add_words(['cot', 'cap', 'kate', 'scat', 'dove'], 'english')
+        engine.remove_words(['hat', 'bat', 'love'], 'english')
+        self.check_engine(engine, {'english': ['cat', 'cut', 'rat', 'glove', 'kate', 'hat']})
+
+    def test_explicit_slant_threshold(self):
+        engine = MultilingualRhymeEngine()
+        default = engine.find_rhymes('cat', 'english', slant='edit', max_edits=2)
+        strict = engine.find_rhymes('cat', 'english', slant='edit', max_edits=2, slant_threshold=0.7)
+        self.assertTrue(any(rhyme.similarity < 0.7 for rhyme in default['slant']))
+        self.assertEqual(strict['slant'], [rhyme for rhyme in default['slant'] if rhyme.similarity >= 0.7])
+
+
+class QueryCacheTest(unittest.TestCase):
+    def test_results_are_caller_owned(self):
+        engine = MultilingualRhymeEngine()
+        engine.enable_cache(16)
+        engine.upsert_translations('english', 'spanish', {'dove': 'paloma'})
+        uncached = MultilingualRhymeEngine()
+        uncached.upsert_translations('english', 'spanish', {'dove': 'paloma'})
+        expected = uncached.find_rhymes('love', 'english')
+        first = engine.find_rhymes('love', 'english')
+        first['perfect'][0].translation['spanish'] = 'changed'
+        first['perfect'][0].word = 'changed'
+        first['perfect'].clear()
+        first['input_analysis']['word'] = 'changed'
+        for _ in range(2):
+            self.assertEqual(engine.find_rhymes('love', 'english'), expected)
+        self.assertEqual(engine.cache_stats()['hits'], 2)
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_entries=2)
+        for key in 'abc':
+            cache.put(key, (key,), cache.generation)
+        self.assertIs(cache.get('a'), cache.get('missing'))
+        self.assertEqual(cache.get('b'), ('b',))
+        cache.put('d', ('d',), cache.generation)
+        self.assertEqual(cache.get('b'), ('b',))
+        self.assertIs(cache.get('c'), cache.get('missing'))
+        self.assertEqual(cache.stats(), {'entries': 2, 'bytes': cache.stats()['bytes'], 'max_entries': 2,
+                                         'max_bytes': None, 'hits': 2, 'misses': 4, 'evictions': 2})
+
+        sized = QueryCache(max_entries=100, max_bytes=600)
+        value = tuple('x' * 10 for _ in range(4))
+        for key in range(10):
+            sized.put(key, value, sized.generation)
+        stats = sized.stats()
+        self.assertLessEqual(stats['bytes'], 600)
+        self.assertEqual(stats['entries'] + stats['evictions'], 10)
+        self.assertEqual(sized.get(9), value)
+        sized.put('huge', tuple(range(1000)), sized.generation)
+        self.assertEqual(sized.stats()['entries'], stats['entries'])
+
+    def test_stale_results_are_not_stored(self):
+        cache = QueryCache()
+        generation = cache.generation
+        cache.clear()
+        cache.put('key', ('value',), generation)
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_invalidation(self):
+        def changes(engine):
+            yield lambda: engine.phonetic_mappings['english'].update({'ove': 'ʌv'})
+            yield lambda: engine.word_dictionaries['english'].append('trove')
+            yield lambda: engine.remove_words(['dove'], 'english')
+            yield lambda: engine.add_words(['mauve'], 'english')
+            yield lambda: engine.upsert_translations('english', 'spanish', {'glove': 'manopla'})
+            yield lambda: engine.translations['english']['spanish'].pop('glove')
+
+        engine = MultilingualRhymeEngine()
+        engine.enable_cache(16)
+        fresh = MultilingualRhymeEngine()
+        for step, (change, fresh_change) in enumerate(zip(changes(engine), changes(fresh))):
+            engine.collect_all_rhymes('love', 'english')
+            change()
+            fresh_change()
+            with self.subTest(step=step):
+                self.assertEqual(engine.collect_all_rhymes('love', 'english'),
+                                 fresh.collect_all_rhymes('love', 'english'))
+
+    def test_attach_lexicon_invalidates(self):
+        import os
+        import tempfile
+
+        engine = MultilingualRhymeEngine()
+        engine.enable_cache(16)
+        self.assertTrue(engine.find_rhymes('love', 'english')['perfect'])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'english.rlx')
+            engine.build_lexicon(['cat', 'hat', 'love'], 'english', path)
+            engine.attach_lexicon('english', path)
+            self.assertEqual(engine.find_rhymes('love', 'english')['perfect'], [])
+            self.assertEqual([rhyme.word for rhyme in engine.find_rhymes('cat', 'english')['perfect']], ['hat'])
+            engine.close()
+
+    def test_copied_tables_are_plain(self):
+        import copy
+        import pickle
+
+        engine = MultilingualRhymeEngine()
+        engine.enable_cache(16)
+        engine.find_rhymes('love', 'english')
+        for table in (engine.word_dictionaries, engine.translations, engine.phonetic_mappings):
+            for copied in (pickle.loads(pickle.dumps(table)), copy.copy(table), copy.deepcopy(table)):
+                self.assertIs(type(copied), dict)
+                self.assertEqual(copied, table)
+        words = pickle.loads(pickle.dumps(engine.word_dictionaries))
+        self.assertIs(type(words['english']), list)
+        # Changing a copy leaves the engine and its cache alone
+        words['english'].append('trove')
+        self.assertEqual(engine.cache_stats()['entries'], 1)
+
+        restored = pickle.loads(pickle.dumps(engine))
+        self.assertEqual(restored.find_rhymes('love', 'english'), engine.find_rhymes('love', 'english'))
+        restored.word_dictionaries['english'].append('trove')
+        self.assertIn('trove', [rhyme.word for rhyme in restored.find_rhymes('love', 'english')['perfect']])
+
+
+class TranslationGraphTest(unittest.TestCase):
+    def entries(self, graph: TranslationGraph) -> Dict[tuple, Dict[str, str]]:
+        return {(language, word): graph.translate(word, language)
+                for language in LANGUAGES for word in graph._words[language]
+                if graph.translate(word, language) is not None}
+
+    def test_reverse_and_pivot_edges(self):
+        graph = TranslationGraph({
+            'spanish': {'english': {'Casa': 'house'}},
+            'english': {'french': {'house': 'maison', 'dog': 'chien'}, 'spanish': {'dog': 'perro', 'hound': 'perro'}}
+        })
+        # Explicit, then reversed, then one pivot through english
+        self.assertEqual(graph.translate('casa', 'spanish'), {'english': 'house', 'french': 'maison'})
+        self.assertEqual(graph.translate('house', 'english'), {'spanish': 'casa', 'french': 'maison'})
+        self.assertEqual(graph.translate('maison', 'french'), {'english': 'house', 'spanish': 'casa'})
+        self.assertEqual(graph.translate('chien', 'french', 'spanish'), 'perro')
+        # Several words translate to perro: the first in alphabetical order is its reverse
+        self.assertEqual(graph.translate('perro', 'spanish'), {'english': 'dog', 'french': 'chien'})
+        self.assertIsNone(graph.translate('cat', 'english'))
+        self.assertIsNone(graph.translate('casa', 'german'))
+
+    def test_updates_match_a_rebuild(self):
+        generator = random.Random(11)
+        vocabulary = {language: [f'{language[:2]}{i}' for i in range(12)] for language in LANGUAGES}
+        tables = {}
+        graph = TranslationGraph(tables)
+        for step in range(300):
+            from_language, to_language = generator.sample(LANGUAGES, 2)
+            table = tables.setdefault(from_language, {}).setdefault(to_language, {})
+            changes = {}
+            for word in generator.sample(vocabulary[from_language], generator.randint(1, 3)):
+                if word in table and generator.random() < 0.3:
+                    del table[word]
+                    changes[word] = None
+                else:
+                    table[word] = changes[word] = generator.choice(vocabulary[to_language])
+            graph.update(tables, from_language, to_language, changes)
+            with self.subTest(step=step):
+                self.assertEqual(self.entries(graph), self.entries(TranslationGraph(tables)))
+
+    def test_translations_are_caller_owned(self):
+        engine = MultilingualRhymeEngine()
+        engine.upsert_translations('english', 'spanish', {'dove': 'paloma'})
+        engine.get_translation('dove', 'english')['spanish'] = 'changed'
+        rhymes = engine.find_rhymes('love', 'english')['perfect']
+        rhymes[0].translation['spanish'] = 'changed'
+        columnar = engine.find_rhymes('love', 'english', columnar=True)['perfect']
+        columnar[0].translation['spanish'] = 'changed'
+        self.assertEqual(engine.get_translation('dove', 'english'), {'spanish': 'paloma'})
+        self.assertEqual(engine.find_rhymes('love', 'english')['perfect'][0].translation, {'spanish': 'paloma'})
+
+    def test_upsert_updates_the_graph(self):
+        engine = MultilingualRhymeEngine()
+        graph = engine._get_translation_graph()
+        engine.upsert_translations('spanish', 'english', {'Paloma': 'dove'})
+        engine.upsert_translations('english', 'french', {'dove': 'colombe'})
+        self.assertIs(engine._get_translation_graph(), graph)
+        self.assertEqual(engine.get_translation('colombe', 'french', 'spanish'), 'paloma')
+        self.assertEqual(self.entries(graph), self.entries(TranslationGraph(engine.translations)))
+        # Other edits to the tables still rebuild it
+        engine.translations['english']['french']['dove'] = 'pigeon'
+        self.assertEqual(engine.get_translation('dove', 'english', 'french'), 'pigeon')
+
+
+class CrossLanguageTest(unittest.TestCase):
+    def check_engine(self, engine: MultilingualRhymeEngine):
+        for language in LANGUAGES:
+            for word in engine.word_dictionaries[language]:
+                for limit in (None, 3):
+                    expected = {}
+                    for target in LANGUAGES:
+                        if target == language:
+                            continue
+                        # The input is read with each target language's rules
+                        target_rows = reference_rhymes(engine, word, target, limit=limit)
+                        if target_rows[0] or target_rows[1]:
+                            expected[target] = target_rows
+                    with self.subTest(word=word, language=language, limit=limit):
+                        cross = engine.find_cross_language_rhymes(word, language, limit)
+                        self.assertEqual({target: rows(results) for target, results in cross.items()}, expected)
+
+    def test_cross_language(self):
+        self.check_engine(MultilingualRhymeEngine())
+
+    def test_cross_language_from_snapshot(self):
+        import os
+        import tempfile
+
+        fd, path = tempfile.mkstemp(suffix='.rsnap')
+        os.close(fd)
+        try:
+            MultilingualRhymeEngine().save_snapshot(path)
+            engine = MultilingualRhymeEngine.load_snapshot(path)
+            self.check_engine(engine)
+            engine.close()
+        finally:
+            os.remove(path)
+
+
+class MappedUpdatesTest(unittest.TestCase):
+    def test_updates_on_top_of_a_lexicon(self):
+        import os
+        import pickle
+        import tempfile
+
+        source = MultilingualRhymeEngine()
+        base = list(source.word_dictionaries['english'])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'english.rlx')
+            source.build_lexicon(base, 'english', path)
+            engine = MultilingualRhymeEngine(lexicon_paths={'english': path})
+            engine.find_rhymes('love', 'english')
+            self.assertEqual(engine.add_words(['trove', 'mauve', 'love', 'bat'], 'english'), 2)
+            self.assertEqual(engine.remove_words(['dove', 'cat', 'mauve', 'nothing'], 'english'), 3)
+            self.assertEqual(engine.add_words(['dove'], 'english'), 1)
+            expected_words = [word for word in base if word not in ('dove', 'cat')] + ['trove', 'dove']
+            self.assertEqual(list(engine.word_dictionaries['english']), expected_words)
+            self.assertNotIsInstance(engine.word_dictionaries['english'], list)
+
+            copies = [engine, pickle.loads(pickle.dumps(engine))]
+            engine.share(os.path.join(directory, 'engine.rsnap'))
+            copies += [engine, pickle.loads(pickle.dumps(engine))]
+            try:
+                for copy in copies:
+                    for word in ['love', 'glove', 'hat', 'trove', 'cat', 'mauve']:
+                        with self.subTest(word=word):
+                            self.assertEqual(rows(copy.find_rhymes(word, 'english')),
+                                             reference_rhymes(copy, word, 'english'))
+                    # Mapped words are exposed once the language is first queried
+                    self.assertEqual(list(copy.word_dictionaries['english']), expected_words)
+            finally:
+                for copy in copies:
+                    copy.close()
+
+
+class SharedEngineTest(unittest.TestCase):
+    def test_share_with_lexicon_language(self):
+        import os
+        import pickle
+        import tempfile
+
+        source = MultilingualRhymeEngine()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'english.rlx')
+            source.build_lexicon(source.word_dictionaries['english'], 'english', path)
+            engine = MultilingualRhymeEngine(lexicon_paths={'english': path})
+            engine.build_rhyme_families()
+            engine.share(os.path.join(directory, 'engine.rsnap'))
+            worker = pickle.loads(pickle.dumps(engine))
+            try:
+                for language in LANGUAGES:
+                    for word in source.word_dictionaries[language][::4]:
+                        with self.subTest(word=word, language=language):
+                            self.assertEqual(rows(worker.find_rhymes(word, language)),
+                                             reference_rhymes(source, word, language))
+            finally:
+                worker.close()
+                engine.close()
+
+
+class BatchRhymesTest(unittest.TestCase):
+    WORDS = ['love', 'cat', ('amor', 'spanish'), 'time', ('chat', 'french'), 'heart', 'night', ('casa', 'spanish')]
+
+    def expected(self) -> list:
+        engine = MultilingualRhymeEngine()
+        return [(item, engine.collect_all_rhymes(*((item, 'english') if isinstance(item, str) else item), limit=4))
+                for item in self.WORDS]
+
+    def test_pool_matches_in_process(self):
+        engine = MultilingualRhymeEngine()
+        expected = self.expected()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            in_process = list(engine.iter_batch_rhymes(self.WORDS, workers=1, chunk_size=3, limit=4))
+            pooled = list(engine.iter_batch_rhymes(self.WORDS, workers=2, chunk_size=3, limit=4))
+            unordered = list(engine.iter_batch_rhymes(iter(self.WORDS), workers=2, chunk_size=2, ordered=False,
+                                                      limit=4))
+        self.assertEqual(out.getvalue(), '')
+        self.assertEqual(in_process, expected)
+        self.assertEqual(pooled, expected)
+        self.assertEqual(sorted(unordered, key=lambda row: str(row[0])), sorted(expected, key=lambda row: str(row[0])))
+
+    def test_progress(self):
+        engine = MultilingualRhymeEngine()
+        for workers in (1, 2):
+            for words, total in ((self.WORDS, len(self.WORDS)), (iter(self.WORDS), None)):
+                calls = []
+                for _ in engine.iter_batch_rhymes(words, workers=workers, chunk_size=3, limit=1,
+                                                  progress=lambda done, total: calls.append((done, total))):
+                    pass
+                with self.subTest(workers=workers, total=total):
+                    self.assertEqual(calls, [(3, total), (6, total), (8, total)])
+
+    def test_options_and_columnar(self):
+        engine = MultilingualRhymeEngine()
+        results = dict(engine.iter_batch_rhymes(['love', 'cat'], workers=2, chunk_size=1, columnar=True,
+                                                cross=False, same_syllables=True))
+        for word in ('love', 'cat'):
+            expected = engine.collect_all_rhymes(word, 'english', cross=False, same_syllables=True)
+            self.assertEqual(results[word]['cross_language'], {})
+            self.assertEqual([row.word for row in results[word]['same_language']['perfect']],
+                             [rhyme.word for rhyme in expected['same_language']['perfect']])
+
+
+class ResultsJsonlTest(unittest.TestCase):
+    def test_round_trip(self):
+        import gzip
+        import os
+        import tempfile
+
+        engine = MultilingualRhymeEngine()
+        words = ['love', 'cat', 'time']
+        expected = [(word, json.loads(json.dumps(engine.collect_all_rhymes(word, 'english', limit=3),
+                                                 default=_rhyme_result_fields)))
+                    for word in words]
+        with tempfile.TemporaryDirectory() as directory:
+            for compress in (False, True):
+                for compact in (False, True):
+                    for source in ('dict', 'iterator'):
+                        with self.subTest(compress=compress, compact=compact, source=source):
+                            path = os.path.join(directory, f'{compress}-{compact}-{source}.jsonl')
+                            results = (dict(engine.iter_batch_rhymes(words, workers=1, limit=3)) if source == 'dict'
+                                       else engine.iter_batch_rhymes(words, workers=1, limit=3))
+                            count = engine.export_results_jsonl(results, path, compress=compress, compact=compact)
+                            self.assertEqual(count, len(words))
+                            self.assertEqual(list(read_results_jsonl(path)), expected)
+
+                            with (gzip.open(path, 'rt', encoding='utf-8') if compress
+                                  else open(path, encoding='utf-8')) as f:
+                                lines = f.read().splitlines()
+                            self.assertEqual(len(lines), len(words))
+                            self.assertEqual(', "' in lines[0], not compact)
+
+
+class MetricsTest(unittest.TestCase):
+    def test_snapshot(self):
+        engine = MultilingualRhymeEngine()
+        self.assertIsNone(engine.metrics_snapshot())
+        engine.enable_cache()
+        engine.enable_metrics(recent=2)
+        engine.find_rhymes('love', 'english')
+        engine.find_rhymes('love', 'english')
+        engine.collect_all_rhymes('cat', 'english')
+        snapshot = engine.metrics_snapshot()
+        json.dumps(snapshot)
+
+        self.assertEqual(snapshot['queries']['find_rhymes']['calls'], 2)
+        self.assertEqual(snapshot['queries']['collect_all_rhymes']['calls'], 1)
+        for stage in ('cache', 'phonetize', 'candidates', 'scoring', 'ranking'):
+            timer = snapshot['stages'][stage]
+            self.assertEqual(set(timer), {'calls', 'total_ms', 'mean_ms', 'max_ms'})
+            self.assertGreaterEqual(timer['calls'], 1)
+            self.assertAlmostEqual(timer['mean_ms'], timer['total_ms'] / timer['calls'])
+            self.assertLessEqual(timer['max_ms'], timer['total_ms'] + 1e-9)
+
+        counters = snapshot['counters']
+        self.assertEqual(counters['cache_hits'], 1)
+        self.assertGreaterEqual(counters['cache_misses'], 2)
+        self.assertGreater(counters['candidates_scanned'], 0)
+        self.assertGreater(counters['candidates_accepted'], 0)
+        self.assertLessEqual(counters['candidates_accepted'], counters['candidates_scanned'])
+
+        # Nested queries fold into the outermost record; only the last two are kept
+        self.assertEqual([record['kind'] for record in snapshot['recent']], ['find_rhymes', 'collect_all_rhymes'])
+        self.assertEqual(snapshot['recent'][0]['counters'], {'cache_hits': 1})
+        self.assertEqual(snapshot['recent'][-1]['word'], 'cat')
+        self.assertLessEqual(sum(snapshot['recent'][-1]['stages'].values()),
+                             snapshot['recent'][-1]['total_ms'] + 1e-6)
+
+    def test_reset_and_disable(self):
+        engine = MultilingualRhymeEngine()
+        engine.enable_cache()
+        engine.enable_metrics()
+        engine.find_rhymes('love', 'english')
+        self.assertEqual(engine.metrics_snapshot(reset=True)['queries']['find_rhymes']['calls'], 1)
+        empty = engine.metrics_snapshot()
+        self.assertEqual((empty['queries'], empty['stages'], empty['counters'], empty['recent']), ({}, {}, {}, []))
+
+        engine.find_rhymes('love', 'english')
+        self.assertEqual(engine.metrics_snapshot()['counters']['cache_hits'], 1)
+        engine.disable_metrics()
+        engine.find_rhymes('dove', 'english')
+        self.assertIsNone(engine.metrics_snapshot())
+
+
+class CommandLineTest(unittest.TestCase):
+    LINES = 'love\namor,spanish\nchat\tfrench\n\nhaus,german\n'
+
+    def run_main(self, *argv: str) -> Tuple[int, str, str]:
+        out, err = io.StringIO(), io.StringIO()
+        with mock.patch('sys.stdin', io.StringIO(self.LINES)), redirect_stdout(out), redirect_stderr(err):
+            status = main(list(argv))
+        return status, out.getvalue(), err.getvalue()
+
+    def expected(self, limit: int, cross: bool = True) -> List[dict]:
+        engine = MultilingualRhymeEngine()
+        records = []
+        for word, language in [('love', 'english'), ('amor', 'spanish'), ('chat', 'french')]:
+            results = engine.collect_all_rhymes(word, language, limit, cross=cross)
+            records.append(json.loads(json.dumps({'word': word, 'language': language, 'results': results},
+                                                 ensure_ascii=False, default=_rhyme_result_fields)))
+        return records
+
+    def test_jsonl(self):
+        status, out, err = self.run_main('--limit', '3')
+        self.assertEqual(status, 0)
+        self.assertEqual([json.loads(line) for line in out.splitlines()], self.expected(3))
+        self.assertEqual(err, '-:5: unsupported language: german\n')
+
+    def test_no_cross(self):
+        _, out, _ = self.run_main('--limit', '3', '--no-cross')
+        records = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual(records, self.expected(3, cross=False))
+        self.assertEqual([record['results']['cross_language'] for record in records], [{}] * 3)
+
+    def test_csv(self):
+        import csv
+
+        status, out, _ = self.run_main('--format', 'csv', '--limit', '2')
+        self.assertEqual(status, 0)
+        table = list(csv.reader(io.StringIO(out)))
+        self.assertEqual(table[0][:6], ['word', 'language', 'rhyme_language', 'type', 'rank', 'rhyme'])
+        expected = []
+        for record in self.expected(2):
+            results = record['results']
+            groups = [(record['language'], results['same_language'])] + list(results['cross_language'].items())
+            for rhyme_language, rhymes in groups:
+                for kind in ('perfect', 'slant'):
+                    for rank, rhyme in enumerate(rhymes[kind], 1):
+                        expected.append([record['word'], record['language'], rhyme_language, kind, str(rank),
+                                         rhyme['word']])
+        self.assertEqual([row[:6] for row in table[1:]], expected)
+
+    def test_rejects_negative_workers(self):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as raised:
+            main(['--workers', '-1'])
+        self.assertEqual(raised.exception.code, 2)
+
+    def test_shares_only_for_a_pool(self):
+        with mock.patch.object(MultilingualRhymeEngine, 'share') as share, mock.patch('os.cpu_count', return_value=1):
+            self.run_main('--workers', '0', '--no-cross')
+        share.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""Checks for rhyme_scheme: line-final words, scheme letters, stanzas and JSON Lines output
+
+Run with `python -m unittest scripts/test_rhyme_scheme.py` (or pytest).
+"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    from .rhyme_algorithm import MultilingualRhymeEngine
+    from .rhyme_scheme import analyze_files, analyze_lines, line_final_word, main, scheme_letter, write_jsonl
+except ImportError:
+    from rhyme_algorithm import MultilingualRhymeEngine
+    from rhyme_scheme import analyze_files, analyze_lines, line_final_word, main, scheme_letter, write_jsonl
+
+POEM = """The cat sat on the mat,
+I gave my heart to love.
+He wore a funny hat,
+And looked to skies above!
+
+
+Time will tell,
+All is well.
+Light the night,
+Shining bright.
+123
+"""
+
+
+def reference_schemes(engine: MultilingualRhymeEngine, lines, language: str = 'english',
+                      suffix_length: int = 2) -> list:
+    """Whole-stanza schemes computed one word at a time"""
+    schemes = []
+    for stanza in '\n'.join(line.rstrip('\n') for line in lines).split('\n\n'):
+        classes = {}
+        scheme = []
+        for line in filter(str.strip, stanza.split('\n')):
+            word = line_final_word(line)
+            if word is None:
+                scheme.append('-')
+                continue
+            suffix = engine.get_rhyming_suffix(engine.get_phonetic_representation(word, language), suffix_length)
+            scheme.append(scheme_letter(classes.setdefault(suffix, len(classes))))
+        if scheme:
+            schemes.append(''.join(scheme))
+    return schemes
+
+
+class RhymeSchemeTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = MultilingualRhymeEngine()
+
+    def test_line_final_word(self):
+        cases = {
+            'The cat sat on the mat,': 'mat',
+            "I really don't": "don't",
+            "C'est aujourd'hui": "aujourd'hui",
+            'a well-known...': 'well-known',
+            'Mi corazón!!': 'corazón',
+            'Le cœur 42': 'cœur',
+            '   ': None,
+            '123 -- ?': None
+        }
+        for line, word in cases.items():
+            with self.subTest(line=line):
+                self.assertEqual(line_final_word(line), word)
+
+    def test_scheme_letter(self):
+        self.assertEqual([scheme_letter(n) for n in (0, 1, 25, 26, 27, 51, 52, 701, 702)],
+                         ['A', 'B', 'Z', 'AA', 'AB', 'AZ', 'BA', 'ZZ', 'AAA'])
+
+    def test_stanzas(self):
+        records = list(analyze_lines(self.engine, io.StringIO(POEM), source='poem.txt'))
+        self.assertEqual([record['scheme'] for record in records], ['ABAB', 'AABB-'])
+        self.assertEqual([record['line'] for record in records], [1, 7])
+        self.assertEqual([record['lines'] for record in records], [4, 5])
+        self.assertEqual(records[0]['words'], ['mat', 'love', 'hat', 'above'])
+        self.assertEqual(records[0]['suffixes'][0], records[0]['suffixes'][2])
+        self.assertEqual(records[1]['words'][-1], None)
+        self.assertEqual(records[1]['suffixes'][-1], None)
+        self.assertEqual({record['source'] for record in records}, {'poem.txt'})
+        self.assertEqual([record['stanza'] for record in records], [1, 2])
+
+        spanish = list(analyze_lines(self.engine, ['amor\n', 'flor\n', 'casa\n', 'masa\n'], 'spanish'))
+        self.assertEqual(spanish[0]['scheme'], 'AABB')
+        self.assertNotIn('source', spanish[0])
+
+    def test_batches_match_reference(self):
+        words = ['cat', 'love', 'time', 'night', 'heart', 'day', 'hat', 'dove', 'light', 'way', 'start', 'rhyme']
+        lines = []
+        for stanza in range(40):
+            lines.extend(f'line {words[(stanza * 7 + i * 5) % len(words)]}\n' for i in range(stanza % 6 + 1))
+            lines.append('\n')
+        expected = reference_schemes(self.engine, lines)
+        for batch_lines in (1, 3, 2048):
+            with self.subTest(batch_lines=batch_lines):
+                records = list(analyze_lines(self.engine, iter(lines), batch_lines=batch_lines))
+                self.assertEqual([record['scheme'] for record in records], expected)
+                self.assertEqual([record['stanza'] for record in records], list(range(1, len(expected) + 1)))
+
+    def test_long_stanzas_are_split(self):
+        lines = [f'word {word}\n' for word in ['cat', 'hat', 'love', 'dove', 'mat']]
+        records = list(analyze_lines(self.engine, lines, max_stanza_lines=2))
+        self.assertEqual([(record['line'], record['lines']) for record in records], [(1, 2), (3, 2), (5, 1)])
+        self.assertEqual([record['scheme'] for record in records], ['AA', 'AA', 'A'])
+
+    def test_wide_schemes_are_spaced(self):
+        lines = [f'{word}\n' for word in ['cat', 'love', 'time', 'night', 'heart', 'day', 'sun', 'moon', 'fire',
+                                          'water', 'earth', 'rain', 'snow', 'wind', 'tree', 'song', 'book',
+                                          'door', 'hand', 'milk', 'bed', 'fish', 'dog', 'pig', 'cup', 'box',
+                                          'jazz', 'rhythm']]
+        scheme = list(analyze_lines(self.engine, lines, suffix_length=3))[0]['scheme']
+        letters = scheme.split(' ')
+        self.assertEqual(len(letters), len(lines))
+        self.assertIn('AA', letters)
+
+    def test_unsupported_language(self):
+        with self.assertRaises(ValueError):
+            list(analyze_lines(self.engine, ['cat\n'], 'klingon'))
+
+    def test_jsonl_output(self):
+        out = io.StringIO()
+        records = list(analyze_lines(self.engine, io.StringIO(POEM)))
+        self.assertEqual(write_jsonl(iter(records), out), 2)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], records)
+        self.assertNotIn(', ', lines[0])
+
+    def test_files_and_command_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = os.path.join(directory, 'first.txt')
+            second = os.path.join(directory, 'second.txt')
+            output = os.path.join(directory, 'schemes.jsonl')
+            with open(first, 'w', encoding='utf-8') as f:
+                f.write(POEM)
+            with open(second, 'w', encoding='utf-8') as f:
+                f.write('amor\nflor\n')
+
+            records = list(analyze_files(self.engine, [first, second]))
+            self.assertEqual([(record['source'], record['scheme']) for record in records],
+                             [(first, 'ABAB'), (first, 'AABB-'), (second, 'AA')])
+
+            self.assertEqual(main([first, '--output', output]), 0)
+            with open(output, encoding='utf-8') as f:
+                self.assertEqual([json.loads(line) for line in f], records[:2])
+
+        out = io.StringIO()
+        with mock.patch('sys.stdin', io.StringIO('casa\nmasa\n')), mock.patch('sys.stdout', out):
+            self.assertEqual(main(['--language', 'spanish']), 0)
+        record = json.loads(out.getvalue())
+        self.assertEqual((record['scheme'], record['words'], record['source']), ('AA', ['casa', 'masa'], '-'))
+
+
+if __name__ == '__main__':
+    unittest.main()
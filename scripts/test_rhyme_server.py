@@ -0,0 +1,99 @@
+"""HTTP checks for rhyme_server: coalescing, batching and request errors
+
+Run with `python -m unittest scripts/test_rhyme_server.py` (or pytest).
+Each test starts a server on a free local port.
+"""
+import asyncio
+import json
+import unittest
+
+try:
+    from .rhyme_algorithm import MultilingualRhymeEngine, _rhyme_result_fields
+    from .rhyme_server import RhymeServer, RhymeService, fetch_json
+except ImportError:
+    from rhyme_algorithm import MultilingualRhymeEngine, _rhyme_result_fields
+    from rhyme_server import RhymeServer, RhymeService, fetch_json
+
+
+async def raw_request(port: int, data: bytes) -> int:
+    """Send raw bytes and return the response status"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(data)
+        await writer.drain()
+        return int((await reader.readline()).split()[1])
+    finally:
+        writer.close()
+
+
+class RhymeServerTest(unittest.TestCase):
+    def serve(self, test, batch_window: float = 0.002):
+        async def run():
+            server = RhymeServer(RhymeService(MultilingualRhymeEngine(), batch_window=batch_window), port=0)
+            await server.start()
+            try:
+                await test(server)
+            finally:
+                await server.close()
+
+        asyncio.run(run())
+
+    def expected(self, word: str, language: str = 'english', limit=None) -> dict:
+        results = MultilingualRhymeEngine().collect_all_rhymes(word, language, limit)
+        return json.loads(json.dumps(results, ensure_ascii=False, default=_rhyme_result_fields))
+
+    def test_identical_queries_are_coalesced(self):
+        async def test(server):
+            requests = [fetch_json(server.host, server.port, '/rhymes?word=love&limit=5') for _ in range(3)]
+            requests.append(fetch_json(server.host, server.port, '/rhymes', {'word': 'Love', 'limit': 5}))
+            responses = await asyncio.gather(*requests)
+            self.assertEqual([status for status, _ in responses], [200] * 4)
+            for _, body in responses:
+                self.assertEqual(body, self.expected('love', limit=5))
+            stats = server.service.stats()
+            self.assertEqual((stats['requests'], stats['queries'], stats['coalesced']), (4, 4, 3))
+            self.assertEqual((stats['batches'], stats['batched_queries']), (1, 1))
+
+        self.serve(test, batch_window=0.5)
+
+    def test_distinct_queries_share_a_batch(self):
+        async def test(server):
+            words = [('love', 'english'), ('cat', 'english'), ('amor', 'spanish')]
+            responses = await asyncio.gather(*(
+                fetch_json(server.host, server.port, '/rhymes', {'word': word, 'language': language, 'cross': False})
+                for word, language in words))
+            for (word, language), (status, body) in zip(words, responses):
+                self.assertEqual(status, 200)
+                self.assertEqual(body['input_analysis']['word'], word)
+            stats = server.service.stats()
+            self.assertEqual((stats['batches'], stats['batched_queries'], stats['coalesced']), (1, 3, 0))
+
+        self.serve(test, batch_window=0.5)
+
+    def test_bad_requests(self):
+        async def test(server):
+            host, port = server.host, server.port
+            for path, payload in [('/rhymes', {'word': 'love', 'limit': [1]}), ('/rhymes', {'word': 'love', 'limit': -1}),
+                                  ('/rhymes', {'word': ' '}), ('/rhymes', {'word': 'love', 'language': 'german'}),
+                                  ('/rhymes', ['love']), ('/rhymes?limit=x&word=love', None), ('/rhymes', None)]:
+                with self.subTest(path=path, payload=payload):
+                    status, body = await fetch_json(host, port, path, payload)
+                    self.assertEqual(status, 400)
+                    self.assertIn('error', body)
+            self.assertEqual((await fetch_json(host, port, '/missing'))[0], 404)
+
+            request = b'POST /rhymes HTTP/1.1\r\nContent-Length: %s\r\n\r\n'
+            self.assertEqual(await raw_request(port, request % b'ten'), 400)
+            self.assertEqual(await raw_request(port, request % b'-5'), 400)
+            self.assertEqual(await raw_request(port, request % str(server.max_body + 1).encode()), 413)
+            self.assertEqual(await raw_request(port, b'PUT /rhymes?word=love HTTP/1.1\r\n\r\n'), 405)
+            self.assertEqual(await raw_request(port, b'garbage\r\n\r\n'), 400)
+            # The server keeps answering after rejected requests
+            self.assertEqual((await fetch_json(host, port, '/health'))[0], 200)
+            self.assertEqual(server.service.stats()['queries'], 0)
+
+        self.serve(test)
+
+
+if __name__ == '__main__':
+    unittest.main()